@@ -1,44 +1,184 @@
-from flask import Flask, render_template, request
-import joblib
+from flask import Flask, jsonify, render_template, request
+from collections import OrderedDict
+import json
+import os
+import threading
+from src.profiling import configure_from_env
 
 # Initialize Flask app
 app = Flask(__name__)
+# Keep importances ranked and contributions in feature order in JSON responses
+app.json.sort_keys = False
+# Opt-in profiling of a sampled fraction of requests via PROFILE_REQUEST_RATE, off by default
+configure_from_env(app)
 
-# Load model
+# Model paths: the native LightGBM file loads without unpickling the sklearn wrapper
 model_path = "artifacts/models/trained_model.pkl"
-model = joblib.load(model_path)
+native_model_path = "artifacts/models/trained_model.txt"
+# Global feature importances written by ModelTraining at training time
+importance_path = "artifacts/models/trained_model_importance.json"
+
+# Largest /explain batch; each instance costs a pred_contrib row and a cache entry
+MAX_EXPLAIN_INSTANCES = 1000
+
+# Rating and category inputs passed to the model as they are
+INTEGER_FIELDS = [
+    "Online boarding",
+    "Inflight wifi service",
+    "Class",
+    "Type of Travel",
+    "Inflight entertainment",
+    "Seat comfort",
+    "Leg room service",
+    "On-board service",
+    "Cleanliness",
+    "Ease of Online booking",
+]
+
+_model = None
+_model_lock = threading.Lock()
+_loader = None
+_loader_lock = threading.Lock()
+_load_error = None
+_importance = None
+
+
+def get_model():
+    """Load the LightGBM booster on first use, so importing the app does not pull in the ML stack."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                if os.path.exists(native_model_path):
+                    import lightgbm as lgb
+                    _model = lgb.Booster(model_file=native_model_path)
+                else:
+                    import joblib
+                    _model = joblib.load(model_path).booster_
+    return _model
+
+
+def _load_model():
+    """Loader thread body; keeps the error so /ready can report it instead of loading forever."""
+    global _load_error
+    try:
+        get_model()
+    except Exception as e:
+        _load_error = e
+
+
+def start_model_loading():
+    """
+    Start loading the model on a background thread, so the server can accept connections
+    meanwhile. Does nothing while the model is loaded or loading; after a failure it retries.
+    """
+    global _loader, _load_error
+    with _loader_lock:
+        if _model is None and (_loader is None or not _loader.is_alive()):
+            _load_error = None
+            _loader = threading.Thread(target=_load_model, daemon=True)
+            _loader.start()
+
+
+def get_feature_names():
+    """Model features in training order; LightGBM stores column names with spaces replaced by underscores."""
+    return [name.replace("_", " ") for name in get_model().feature_name()]
+
+
+def get_global_importance():
+    """Load the importances precomputed at training time, or None if the model was trained without them."""
+    global _importance
+    if _importance is None and os.path.exists(importance_path):
+        with open(importance_path) as f:
+            _importance = json.load(f)
+    return _importance
+
+
+class PredictionCache:
+    """Thread-safe LRU cache of model outputs keyed by feature row."""
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+prediction_cache = PredictionCache()
+
+
+def build_feature_row(fields):
+    """Turn raw form or JSON fields into a feature row ordered like the model's training columns."""
+    departure_delay = float(fields["Departure Delay"])
+    arrival_delay = float(fields["Arrival Delay"])
+    flight_distance = float(fields["Flight Distance"])
+    # Negative distances make no sense and -1 would divide by zero below; NaN fails this check too
+    if not flight_distance >= 0:
+        raise ValueError(f"Flight Distance must be a non-negative number, got {fields['Flight Distance']}")
+
+    # Calculate Delay Ratio
+    features = {
+        "Delay Ratio": (departure_delay + arrival_delay) / (flight_distance + 1),
+        "Flight Distance": flight_distance,
+    }
+    features.update({field: int(fields[field]) for field in INTEGER_FIELDS})
+    return tuple(features[name] for name in get_feature_names())
+
+
+def predict_probability(row):
+    """Probability of the satisfied class for one feature row, served from the cache when possible."""
+    entry = prediction_cache.get(row)
+    if entry is None:
+        entry = {"probability": float(get_model().predict([row])[0])}
+        prediction_cache.put(row, entry)
+    return entry["probability"]
+
+
+def explain_rows(rows):
+    """
+    Per-feature contributions for a batch of feature rows. Rows missing from the
+    cache are explained together in a single vectorized ``pred_contrib`` call.
+    """
+    import numpy as np
+
+    entries = [prediction_cache.get(row) for row in rows]
+    missing = [i for i, entry in enumerate(entries) if entry is None or "contributions" not in entry]
+    if missing:
+        contributions = get_model().predict(np.array([rows[i] for i in missing], dtype=np.float64), pred_contrib=True)
+        # Contributions and the bias (last column) add up to the raw score, i.e. the log-odds
+        probabilities = 1.0 / (1.0 + np.exp(-contributions.sum(axis=1)))
+        for i, row_contributions, probability in zip(missing, contributions, probabilities):
+            entries[i] = {
+                "probability": float(probability),
+                "contributions": row_contributions[:-1].tolist(),
+                "bias": float(row_contributions[-1]),
+            }
+            prediction_cache.put(rows[i], entries[i])
+    return entries
+
 
 @app.route("/", methods=["GET", "POST"])
 def home():
     if request.method == "POST":
         try:
-            # Collect inputs from the form
-            departure_delay = float(request.form["Departure Delay"])
-            arrival_delay = float(request.form["Arrival Delay"])
-            flight_distance = float(request.form["Flight Distance"])
-            
-            # Calculate Delay Ratio
-            delay_ratio = (departure_delay + arrival_delay) / (flight_distance + 1)
-            
-            # Prepare input data for the model
-            data = [
-                delay_ratio,
-                flight_distance,
-                int(request.form["Online boarding"]),
-                int(request.form["Inflight wifi service"]),
-                int(request.form["Class"]),
-                int(request.form["Type of Travel"]),
-                int(request.form["Inflight entertainment"]),
-                int(request.form["Seat comfort"]),
-                int(request.form["Leg room service"]),
-                int(request.form["On-board service"]),
-                int(request.form["Cleanliness"]),
-                int(request.form["Ease of Online booking"]),
-            ]
-
-            # Model prediction
-            prediction = model.predict([data])
-            output = prediction[0]
+            # Collect inputs from the form and prepare them for the model
+            row = build_feature_row(request.form)
+
+            # Model prediction (the booster returns the probability of class 1)
+            output = int(predict_probability(row) > 0.5)
 
             return render_template("index.html", prediction=output)
 
@@ -47,5 +187,66 @@ def home():
 
     return render_template("index.html")
 
+
+@app.route("/ready")
+def ready():
+    """
+    Readiness check: 200 once the model is loaded, 503 while it is still loading and
+    500 with the error when loading failed. Each check after a failure starts a new attempt.
+    """
+    if _model is not None:
+        return jsonify(status="ready")
+    error = _load_error
+    start_model_loading()
+    if error is not None:
+        return jsonify(status="failed", error=str(error)), 500
+    return jsonify(status="loading"), 503
+
+
+@app.route("/explain", methods=["GET", "POST"])
+def explain():
+    """
+    GET returns the global feature importances computed at training time.
+    POST takes one passenger as a JSON object, or several as a list or as
+    ``{"instances": [...]}``, with the same fields as the form, and returns the
+    prediction with each feature's contribution to the log-odds. Batches above
+    MAX_EXPLAIN_INSTANCES are rejected with 413.
+    """
+    if request.method == "GET":
+        importance = get_global_importance()
+        if importance is None:
+            return jsonify(error="Feature importances not found, retrain the model to create them"), 404
+        return jsonify(importance)
+
+    payload = request.get_json(silent=True)
+    single = isinstance(payload, dict) and "instances" not in payload
+    instances = [payload] if single else payload.get("instances") if isinstance(payload, dict) else payload
+    if not isinstance(instances, list) or not instances:
+        return jsonify(error="Expected a JSON object, a list of objects or {\"instances\": [...]}"), 400
+    if len(instances) > MAX_EXPLAIN_INSTANCES:
+        return jsonify(error=f"At most {MAX_EXPLAIN_INSTANCES} instances per request, got {len(instances)}"), 413
+
+    try:
+        rows = [build_feature_row(instance) for instance in instances]
+    except KeyError as e:
+        return jsonify(error=f"Missing field: {e.args[0]}"), 400
+    except (TypeError, ValueError) as e:
+        return jsonify(error=f"Invalid input: {e}"), 400
+
+    feature_names = get_feature_names()
+    explanations = [
+        {
+            "prediction": int(entry["probability"] > 0.5),
+            "probability": entry["probability"],
+            "bias": entry["bias"],
+            "contributions": dict(zip(feature_names, entry["contributions"])),
+        }
+        for entry in explain_rows(rows)
+    ]
+    return jsonify(explanations[0] if single else {"explanations": explanations})
+
+
 if __name__ == "__main__":
+    # Load the model in the background so the server accepts connections right away
+    start_model_loading()
     app.run(host="0.0.0.0", port=5000)
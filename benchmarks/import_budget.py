@@ -0,0 +1,96 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import budgets in seconds for the CLI stages and the service
+IMPORT_BUDGETS = {
+    "application": 0.5,
+    "src.data_ingestion": 2.0,
+    "src.data_processing": 1.0,
+    "src.feature_engineering": 2.0,
+    "src.model_training": 2.0,
+    "src.model_selection": 2.0,
+    "src.database_extraction": 0.5,
+}
+
+
+def measure_import(module, runs=3):
+    """
+    Import ``module`` in fresh interpreters under ``-X importtime``.
+
+    Runs from the repo root, where the service and the stages resolve their relative paths.
+
+    Returns:
+        tuple: Best wall-clock seconds over ``runs`` and the ``-X importtime`` report of that run.
+    """
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT, capture_output=True, text=True,
+        )
+        elapsed = time.perf_counter() - start
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+        if best is None or elapsed < best[0]:
+            best = (elapsed, completed.stderr)
+    return best
+
+
+def import_costs_by_package(importtime_report):
+    """
+    Sum the self time of every imported module per top-level package.
+
+    Returns:
+        dict: Seconds spent importing each top-level package.
+    """
+    costs = defaultdict(float)
+    for line in importtime_report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        costs[name.strip().split(".")[0]] += int(self_us) / 1e6
+    return dict(costs)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check import time of the pipeline stages and the service.")
+    parser.add_argument("modules", nargs="*", default=list(IMPORT_BUDGETS),
+                        help="Modules to check. Defaults to every module with a budget.")
+    parser.add_argument("--budget", type=float, help="Budget in seconds applied to every module instead of the defaults.")
+    parser.add_argument("--top", type=int, default=5, help="Number of dominating packages reported per module.")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per module; the fastest run counts.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    over_budget = []
+    for module in args.modules:
+        budget = args.budget if args.budget is not None else IMPORT_BUDGETS.get(module)
+        elapsed, report = measure_import(module, runs=args.runs)
+        costs = import_costs_by_package(report)
+
+        status = "ok" if budget is None or elapsed <= budget else "OVER"
+        budget_text = f"{budget:.2f}s" if budget is not None else "none"
+        print(f"{module}: {elapsed:.2f}s (budget {budget_text}) {status}")
+        for package, seconds in sorted(costs.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"    {package:<24} {seconds:.3f}s")
+        if status == "OVER":
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"Over import budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import numpy as np
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_URL = "http://127.0.0.1:5000"
+DEFAULT_BASELINE_PATH = os.path.join("benchmarks", "load_test_baseline.json")
+DEFAULT_THRESHOLD = 0.2
+
+# Absolute error-rate increase tolerated before it counts as a regression
+ERROR_RATE_TOLERANCE = 0.01
+
+# Load settings that must match the baseline for latencies to be comparable
+SCENARIO_KEYS = ("concurrency", "target_rps")
+
+# The form handler renders failures into a 200 page instead of returning an error status
+HTML_ERROR_MARKER = b"Error:"
+
+RATING_FIELDS = [
+    "Online boarding",
+    "Inflight wifi service",
+    "Inflight entertainment",
+    "Seat comfort",
+    "Leg room service",
+    "On-board service",
+    "Cleanliness",
+    "Ease of Online booking",
+]
+
+
+def synthetic_payloads(n_payloads, seed=42):
+    """
+    Generate form payloads for the prediction page with the same fields and value
+    ranges as templates/index.html.
+
+    Parameters:
+        n_payloads (int): Number of payloads to generate.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        list: Payload dicts with ``path`` and ``form`` keys.
+    """
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for _ in range(n_payloads):
+        departure_delay = float(rng.exponential(15.0)) if rng.random() < 0.45 else 0.0
+        form = {
+            "Departure Delay": round(departure_delay, 2),
+            "Arrival Delay": round(max(0.0, departure_delay + float(rng.normal(0.0, 8.0))), 2),
+            "Flight Distance": float(rng.integers(31, 4983)),
+            "Class": int(rng.integers(0, 3)),
+            "Type of Travel": int(rng.integers(0, 2)),
+        }
+        form.update({field: int(rng.integers(0, 6)) for field in RATING_FIELDS})
+        payloads.append({"path": "/", "form": form})
+    return payloads
+
+
+def load_payloads(path):
+    """
+    Load recorded payloads from a JSON lines file. Each line holds a ``path`` and
+    either a ``form`` dict (sent url-encoded) or a ``json`` body.
+    """
+    with open(path) as f:
+        payloads = [json.loads(line) for line in f if line.strip()]
+    if not payloads:
+        raise ValueError(f"No payloads found in {path}")
+    return payloads
+
+
+def build_request(base_url, payload):
+    url = base_url.rstrip("/") + payload.get("path", "/")
+    if "json" in payload:
+        body = json.dumps(payload["json"]).encode()
+        headers = {"Content-Type": "application/json"}
+    else:
+        body = urllib.parse.urlencode(payload["form"]).encode()
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    return urllib.request.Request(url, data=body, headers=headers, method="POST")
+
+
+def send_request(request, timeout):
+    """Send a request and report whether it succeeded."""
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+        if response.headers.get_content_type() == "text/html" and HTML_ERROR_MARKER in body:
+            return False
+        return True
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+def run_load(base_url, payloads, concurrency=8, rps=None, duration=30.0, timeout=10.0):
+    """
+    Replay payloads round-robin against the service from ``concurrency`` client threads.
+
+    With ``rps`` set, requests follow a fixed open-loop schedule and latency is
+    measured from each request's scheduled start, so time spent queued behind a
+    slow server counts against it. Without ``rps``, clients send back to back.
+
+    Returns:
+        dict: Throughput, latency percentiles and error rate.
+    """
+    requests = [build_request(base_url, payload) for payload in payloads]
+    slots = itertools.count()
+    lock = threading.Lock()
+    latencies = []
+    errors = 0
+
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def client():
+        nonlocal errors
+        while True:
+            with lock:
+                slot = next(slots)
+            scheduled = start + slot / rps if rps else time.perf_counter()
+            if scheduled >= deadline:
+                return
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            ok = send_request(requests[slot % len(requests)], timeout)
+            latency = time.perf_counter() - scheduled
+            with lock:
+                latencies.append(latency)
+                if not ok:
+                    errors += 1
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = len(latencies)
+    latencies_ms = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if total else (float("nan"),) * 3
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "throughput_rps": total / elapsed,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "concurrency": concurrency,
+        "target_rps": rps,
+        "duration_s": elapsed,
+    }
+
+
+def scenario_mismatches(result, baseline):
+    """
+    Settings that differ between a result and the stored baseline; latencies and
+    throughput are only comparable when the load itself was the same.
+
+    Returns:
+        list: Human-readable descriptions of every differing setting.
+    """
+    return [
+        f"{key}: baseline {baseline.get(key)}, this run {result[key]}"
+        for key in SCENARIO_KEYS
+        if baseline.get(key) != result[key]
+    ]
+
+
+def compare_to_baseline(result, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare a load test result to a stored one.
+
+    Returns:
+        list: Human-readable descriptions of every metric that regressed beyond the threshold.
+    """
+    regressions = []
+    for metric in ("p50_ms", "p95_ms", "p99_ms"):
+        if result[metric] > baseline[metric] * (1 + threshold):
+            regressions.append(f"{metric}: {baseline[metric]:.1f} -> {result[metric]:.1f}")
+    if result["throughput_rps"] < baseline["throughput_rps"] * (1 - threshold):
+        regressions.append(f"throughput_rps: {baseline['throughput_rps']:.1f} -> {result['throughput_rps']:.1f}")
+    if result["error_rate"] > baseline["error_rate"] + ERROR_RATE_TOLERANCE:
+        regressions.append(f"error_rate: {baseline['error_rate']:.2%} -> {result['error_rate']:.2%}")
+    return regressions
+
+
+def start_server(base_url, startup_timeout=60.0):
+    """
+    Start application.py in a subprocess and wait until it reports ready, i.e. the
+    model has loaded. Accepting connections is not enough: the model loads lazily,
+    so the first measured requests would otherwise wait for it.
+    """
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    server = subprocess.Popen([sys.executable, "application.py"], cwd=repo_root)
+    ready_url = base_url.rstrip("/") + "/ready"
+
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"application.py exited with code {server.returncode}")
+        try:
+            urllib.request.urlopen(ready_url, timeout=1.0).close()
+            logger.info(f"Service ready at {base_url}")
+            return server
+        except urllib.error.HTTPError as e:
+            # 503 while the model loads, 500 once loading has failed
+            if e.code == 500:
+                detail = e.read().decode(errors="replace")
+                server.terminate()
+                raise RuntimeError(f"Service could not load the model: {detail}")
+            time.sleep(0.2)
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+
+    server.terminate()
+    raise RuntimeError(f"Service was not ready within {startup_timeout}s")
+
+
+def warm_up(base_url, payloads, n_requests, timeout):
+    """Send unmeasured requests first, so cold-start work never lands in the measured percentiles."""
+    for payload in itertools.islice(itertools.cycle(payloads), n_requests):
+        send_request(build_request(base_url, payload), timeout)
+
+
+def print_report(name, result):
+    print(f"Scenario '{name}': {result['requests']} requests in {result['duration_s']:.1f}s "
+          f"with {result['concurrency']} clients (target rps: {result['target_rps'] or 'unbounded'})")
+    print(f"  throughput: {result['throughput_rps']:.1f} req/s")
+    print(f"  latency:    p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms")
+    print(f"  errors:     {result['errors']} ({result['error_rate']:.2%})")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the prediction service.")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Base URL of the running service.")
+    parser.add_argument("--start-server", action="store_true", help="Start application.py locally for the run.")
+    parser.add_argument("--payloads", help="JSON lines file of recorded payloads. Synthetic form payloads otherwise.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent clients.")
+    parser.add_argument("--rps", type=float, help="Target requests per second. Unbounded when omitted.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Test duration in seconds.")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for synthetic payloads.")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests sent before the test.")
+    parser.add_argument("--name", default="form", help="Scenario name the result is stored under in the baseline.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline JSON to compare against.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the result as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative latency or throughput change flagged as a regression.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    payloads = load_payloads(args.payloads) if args.payloads else synthetic_payloads(1000, seed=args.seed)
+
+    server = start_server(args.url) if args.start_server else None
+    try:
+        warm_up(args.url, payloads, args.warmup, args.timeout)
+        result = run_load(args.url, payloads, concurrency=args.concurrency, rps=args.rps,
+                          duration=args.duration, timeout=args.timeout)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print_report(args.name, result)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        baseline[args.name] = result
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline for '{args.name}' written to {args.baseline}")
+        return 0
+
+    if args.name not in baseline:
+        print(f"No baseline for '{args.name}' in {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    mismatches = scenario_mismatches(result, baseline[args.name])
+    if mismatches:
+        print(f"Not comparing to the baseline for '{args.name}', the scenario differs:")
+        for mismatch in mismatches:
+            print(f"  {mismatch}")
+        print("Rerun with the baseline's settings, or pick another --name.")
+        return 2
+
+    regressions = compare_to_baseline(result, baseline[args.name], threshold=args.threshold)
+    if regressions:
+        print(f"Regressions beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import pathlib
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.synthetic_data import BASE_ROWS, write_raw_data
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+STAGES = ["data_ingestion", "data_processing", "feature_engineering", "model_training"]
+
+# A single grid point keeps training time about fitting, not about the search size
+BENCHMARK_PARAMS = {"learning_rate": [0.1], "n_estimators": [100], "max_depth": [10]}
+
+DEFAULT_BASELINE_PATH = os.path.join("benchmarks", "baseline.json")
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_THRESHOLD = 0.2
+
+# Differences below this many seconds are treated as timer noise
+MIN_SECONDS_DELTA = 0.5
+
+# FeatureEngineer options that must match the baseline for its timings to be comparable; unset means in-memory mode
+FEATURE_OPTION_KEYS = ("block_rows", "num_workers")
+
+
+def stage_paths(work_dir):
+    """Build the artifact layout used by a benchmark run, mirroring config/paths_config.py."""
+    ingested_dir = os.path.join(work_dir, "ingested_data")
+    return {
+        "raw": os.path.join(work_dir, "raw", "data.csv"),
+        "ingested_dir": ingested_dir,
+        "train": os.path.join(ingested_dir, "train.csv"),
+        "test": os.path.join(ingested_dir, "test.csv"),
+        "processed": os.path.join(work_dir, "processed_data", "processed_train.csv"),
+        "engineered": os.path.join(work_dir, "engineered_data", "final_df.csv"),
+        "params": os.path.join(work_dir, "params.json"),
+        "model": os.path.join(work_dir, "models", "trained_model.pkl"),
+        "mlflow_db": os.path.join(work_dir, "mlflow.db"),
+        "mlflow_artifacts": os.path.join(work_dir, "mlartifacts"),
+    }
+
+
+# Output checked after each stage; the stage classes log their errors instead of raising
+STAGE_OUTPUTS = {
+    "data_ingestion": "train",
+    "data_processing": "processed",
+    "feature_engineering": "engineered",
+    "model_training": "model",
+}
+
+
+def run_stage(stage, paths, feature_options=None):
+    """
+    Run one pipeline stage and measure it. Executed in a fresh process so peak
+    RSS belongs to this stage alone.
+
+    ``feature_options`` are passed to FeatureEngineer, e.g. ``block_rows`` and
+    ``num_workers`` for the chunked mode.
+
+    Returns:
+        dict: Elapsed seconds, peak resident memory in MB, and ``status`` "failed"
+            with the ``error`` message when the stage raised.
+    """
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage: {stage}")
+
+    start = time.perf_counter()
+    try:
+        if stage == "data_ingestion":
+            from src.data_ingestion import DataIngestion
+
+            ingestion = DataIngestion(raw_data_path=paths["raw"], ingested_data_dir=paths["ingested_dir"])
+            ingestion.create_ingested_data_dir()
+            start = time.perf_counter()
+            ingestion.split_data(train_path=paths["train"], test_path=paths["test"])
+        elif stage == "data_processing":
+            from src.data_processing import DataProcessor
+
+            processor = DataProcessor(train_data_path=paths["train"], processed_data_path=paths["processed"])
+            start = time.perf_counter()
+            processor.run()
+        elif stage == "feature_engineering":
+            from src.feature_engineering import FeatureEngineer
+
+            feature_engineer = FeatureEngineer(
+                data_path=paths["processed"], output_path=paths["engineered"], **(feature_options or {})
+            )
+            start = time.perf_counter()
+            feature_engineer.run()
+        elif stage == "model_training":
+            # Current MLflow refuses file: stores; runs and artifacts both stay inside the work dir
+            os.environ["MLFLOW_TRACKING_URI"] = f"sqlite:///{os.path.abspath(paths['mlflow_db'])}"
+            import mlflow
+            from src.model_training import ModelTraining
+
+            model_trainer = ModelTraining(
+                data_path=paths["engineered"], params_path=paths["params"], model_save_path=paths["model"]
+            )
+            if mlflow.get_experiment_by_name(model_trainer.experiment_name) is None:
+                artifact_location = pathlib.Path(paths["mlflow_artifacts"]).absolute().as_uri()
+                mlflow.create_experiment(model_trainer.experiment_name, artifact_location=artifact_location)
+            start = time.perf_counter()
+            model_trainer.run()
+    except Exception as e:
+        # Only the message goes back: CustomException cannot be unpickled in the parent process
+        logger.error(f"Benchmark stage {stage} failed: {e}")
+        elapsed = time.perf_counter() - start
+        return {"seconds": elapsed, "peak_rss_mb": peak_rss_mb(), "status": "failed", "error": str(e)}
+
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "peak_rss_mb": peak_rss_mb()}
+
+
+def peak_rss_mb():
+    """
+    Peak resident memory of this process in MB. Linux keeps ru_maxrss across exec, so a
+    spawned stage would report the benchmark parent's peak; VmHWM starts fresh instead.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def stage_input_rows(stage, n_rows):
+    """Rows consumed by a stage, given the raw row count and the 80/20 ingestion split."""
+    if stage == "data_ingestion":
+        return n_rows
+    return n_rows - math.ceil(0.2 * n_rows)
+
+
+def benchmark_scale(scale, work_dir, seed=42, feature_options=None):
+    """
+    Generate data at ``scale`` and run every stage on it.
+
+    Returns:
+        dict: Per-stage measurements keyed by stage name.
+    """
+    paths = stage_paths(work_dir)
+    n_rows = write_raw_data(paths["raw"], scale=scale, seed=seed)
+    with open(paths["params"], "w") as f:
+        json.dump(BENCHMARK_PARAMS, f)
+
+    results = {}
+    spawn_context = multiprocessing.get_context("spawn")
+    for stage in STAGES:
+        # A reused --work-dir still holds the last run's output, which would pass for this run's
+        output = paths[STAGE_OUTPUTS[stage]]
+        if os.path.exists(output):
+            os.remove(output)
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn_context) as pool:
+            measurement = pool.submit(run_stage, stage, paths, feature_options).result()
+
+        rows = stage_input_rows(stage, n_rows)
+        if stage == "feature_engineering":
+            measurement["options"] = {key: (feature_options or {}).get(key) for key in FEATURE_OPTION_KEYS}
+        measurement["rows"] = rows
+        measurement["rows_per_sec"] = rows / measurement["seconds"] if measurement["seconds"] > 0 else None
+        if measurement.get("status") != "failed":
+            measurement["status"] = "ok" if os.path.exists(output) else "failed"
+        results[stage] = measurement
+
+        logger.info(f"Benchmark {scale}x {stage}: {measurement}")
+        if measurement["status"] != "ok":
+            # Later stages have no input to work on
+            break
+
+    return results
+
+
+def scenario_mismatches(results, baseline):
+    """
+    Stage options that differ between results and the stored baseline. Baselines
+    recorded without options ran feature engineering in memory.
+
+    Returns:
+        list: Human-readable descriptions of every differing option.
+    """
+    mismatches = []
+    for scale_key, stages in results.items():
+        current = stages.get("feature_engineering")
+        previous = baseline.get(scale_key, {}).get("feature_engineering")
+        if current is None or previous is None:
+            continue
+        for key in FEATURE_OPTION_KEYS:
+            if current["options"].get(key) != previous.get("options", {}).get(key):
+                mismatches.append(f"{scale_key} feature_engineering {key}: baseline "
+                                  f"{previous.get('options', {}).get(key)}, this run {current['options'].get(key)}")
+    return mismatches
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results against a stored baseline.
+
+    Returns:
+        list: Human-readable descriptions of every metric that regressed beyond the threshold.
+    """
+    regressions = []
+    for scale_key, stages in results.items():
+        for stage, current in stages.items():
+            previous = baseline.get(scale_key, {}).get(stage)
+            if previous is None:
+                continue
+            if current["status"] != "ok":
+                regressions.append(f"{scale_key} {stage}: stage failed")
+                continue
+            for metric in ("seconds", "peak_rss_mb"):
+                if current[metric] <= previous[metric] * (1 + threshold):
+                    continue
+                if metric == "seconds" and current[metric] - previous[metric] < MIN_SECONDS_DELTA:
+                    continue
+                change = current[metric] / previous[metric] - 1
+                regressions.append(
+                    f"{scale_key} {stage}: {metric} {previous[metric]:.2f} -> {current[metric]:.2f} (+{change:.0%})"
+                )
+    return regressions
+
+
+def print_report(results):
+    print(f"{'scale':>6}  {'stage':<20} {'status':<7} {'rows':>11} {'seconds':>9} {'rows/s':>12} {'peak MB':>9}")
+    for scale_key, stages in results.items():
+        for stage, m in stages.items():
+            rows_per_sec = f"{m['rows_per_sec']:.0f}" if m["rows_per_sec"] else "-"
+            print(f"{scale_key:>6}  {stage:<20} {m['status']:<7} {m['rows']:>11} "
+                  f"{m['seconds']:>9.2f} {rows_per_sec:>12} {m['peak_rss_mb']:>9.1f}")
+    for scale_key, stages in results.items():
+        for stage, m in stages.items():
+            if m.get("error"):
+                print(f"{scale_key} {stage} failed: {m['error']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the training pipeline on synthetic data.")
+    parser.add_argument("--scales", type=float, nargs="+", default=DEFAULT_SCALES,
+                        help=f"Multiples of the original {BASE_ROWS} rows to benchmark.")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic data generator.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline JSON to compare against.")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown or memory growth flagged as a regression.")
+    parser.add_argument("--output", help="Also write the results JSON to this path.")
+    parser.add_argument("--work-dir", help="Directory for generated data. A temporary one is used by default.")
+    parser.add_argument("--feature-block-rows", type=int,
+                        help="Run feature engineering in chunked mode with row blocks of this size.")
+    parser.add_argument("--feature-workers", type=int, help="Worker processes for chunked feature engineering.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    feature_options = {"block_rows": args.feature_block_rows, "num_workers": args.feature_workers}
+
+    results = {}
+    for scale in args.scales:
+        scale_key = f"{scale:g}x"
+        if args.work_dir:
+            work_dir = os.path.join(args.work_dir, scale_key)
+            os.makedirs(work_dir, exist_ok=True)
+            results[scale_key] = benchmark_scale(scale, work_dir, seed=args.seed, feature_options=feature_options)
+        else:
+            work_dir = tempfile.mkdtemp(prefix=f"pipeline_benchmark_{scale_key}_")
+            try:
+                results[scale_key] = benchmark_scale(scale, work_dir, seed=args.seed, feature_options=feature_options)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    mismatches = scenario_mismatches(results, baseline)
+    if mismatches:
+        print("Not comparing to the baseline, the scenario differs:")
+        for mismatch in mismatches:
+            print(f"  {mismatch}")
+        print("Rerun with the baseline's options, or compare against another --baseline.")
+        return 2
+
+    regressions = compare_to_baseline(results, baseline, threshold=args.threshold)
+    if regressions:
+        print(f"Regressions beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
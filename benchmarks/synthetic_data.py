@@ -0,0 +1,122 @@
+import os
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Row count of the original airline satisfaction extract, i.e. scale 1x
+BASE_ROWS = 103904
+
+RATING_COLUMNS = [
+    "Inflight wifi service",
+    "Departure/Arrival time convenient",
+    "Ease of Online booking",
+    "Gate location",
+    "Food and drink",
+    "Online boarding",
+    "Seat comfort",
+    "Inflight entertainment",
+    "On-board service",
+    "Leg room service",
+    "Baggage handling",
+    "Checkin service",
+    "Inflight service",
+    "Cleanliness",
+]
+
+# Column order of artifacts/raw/data.csv
+RAW_COLUMNS = (
+    ["MyUnknownColumn", "id", "Gender", "Customer Type", "Age", "Type of Travel", "Class", "Flight Distance"]
+    + RATING_COLUMNS
+    + ["Departure Delay in Minutes", "Arrival Delay in Minutes", "satisfaction"]
+)
+
+# Marginal distributions observed in the real extract
+RATING_PROBS = [0.03, 0.17, 0.25, 0.25, 0.19, 0.11]
+ARRIVAL_DELAY_NULL_RATE = 0.003
+
+
+def generate_raw_data(n_rows, seed=42, start_index=0):
+    """
+    Generate a synthetic frame matching the raw airline satisfaction schema.
+
+    Ratings, delays and categorical columns follow the marginals of the real data.
+    Delays are zero-inflated and heavy-tailed so the IQR clipping in DataProcessor
+    has outliers to work on, ``Arrival Delay in Minutes`` contains nulls, and
+    ``satisfaction`` depends on the service ratings so feature selection and
+    training behave like they do on the real data.
+
+    Parameters:
+        n_rows (int): Number of rows to generate.
+        seed (int): Seed for the random generator.
+        start_index (int): Offset for the index-like columns, used when writing in chunks.
+
+    Returns:
+        pd.DataFrame: Synthetic raw data.
+    """
+    rng = np.random.default_rng(seed)
+
+    data = {
+        "MyUnknownColumn": np.arange(start_index, start_index + n_rows),
+        "id": rng.integers(1, 130000, n_rows),
+        "Gender": rng.choice(["Female", "Male"], n_rows, p=[0.51, 0.49]),
+        "Customer Type": rng.choice(["Loyal Customer", "disloyal Customer"], n_rows, p=[0.82, 0.18]),
+        "Age": rng.integers(7, 86, n_rows),
+        "Type of Travel": rng.choice(["Business travel", "Personal Travel"], n_rows, p=[0.69, 0.31]),
+        "Class": rng.choice(["Business", "Eco", "Eco Plus"], n_rows, p=[0.48, 0.45, 0.07]),
+        "Flight Distance": np.clip(rng.lognormal(6.7, 0.8, n_rows), 31, 4983).astype(np.int64),
+    }
+    for column in RATING_COLUMNS:
+        data[column] = rng.choice(6, n_rows, p=RATING_PROBS)
+
+    # Most flights leave on time, the rest follow a long exponential tail
+    delayed = rng.random(n_rows) < 0.44
+    departure_delay = np.where(delayed, rng.exponential(30.0, n_rows), 0.0).astype(np.int64)
+    arrival_delay = np.clip(departure_delay + rng.normal(0.0, 8.0, n_rows), 0, None).round()
+    arrival_delay[rng.random(n_rows) < ARRIVAL_DELAY_NULL_RATE] = np.nan
+    data["Departure Delay in Minutes"] = departure_delay
+    data["Arrival Delay in Minutes"] = arrival_delay
+
+    score = (
+        0.9 * (data["Online boarding"] - 3)
+        + 0.5 * (data["Inflight wifi service"] - 3)
+        + 0.3 * (data["Inflight entertainment"] - 3)
+        + 0.2 * (data["Seat comfort"] - 3)
+        + 1.2 * (data["Class"] == "Business")
+        + 1.0 * (data["Type of Travel"] == "Business travel")
+        - 0.01 * departure_delay
+        - 1.3
+    )
+    satisfied = rng.random(n_rows) < 1.0 / (1.0 + np.exp(-score))
+    data["satisfaction"] = np.where(satisfied, "satisfied", "neutral or dissatisfied")
+
+    return pd.DataFrame(data, columns=RAW_COLUMNS)
+
+
+def write_raw_data(path, scale=1.0, seed=42, chunk_size=1_000_000):
+    """
+    Write a synthetic raw CSV of ``scale`` times the original size, in chunks so
+    memory stays bounded at large scales.
+
+    Parameters:
+        path (str): Output CSV path.
+        scale (float): Multiple of the original row count.
+        seed (int): Seed for the random generator; each chunk gets its own child seed.
+        chunk_size (int): Rows generated per chunk.
+
+    Returns:
+        int: Number of rows written.
+    """
+    n_rows = int(BASE_ROWS * scale)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    n_chunks = max(1, -(-n_rows // chunk_size))
+    chunk_seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    for i, chunk_seed in enumerate(chunk_seeds):
+        start = i * chunk_size
+        chunk = generate_raw_data(min(chunk_size, n_rows - start), seed=chunk_seed, start_index=start)
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+
+    logger.info(f"Synthetic raw data written to {path}: {n_rows} rows (scale {scale}x)")
+    return n_rows
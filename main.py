@@ -1,3 +1,4 @@
+import argparse
 from src.data_ingestion import DataIngestion
 from src.data_processing import DataProcessor
 from src.feature_engineering import FeatureEngineer
@@ -5,11 +6,22 @@ from src.model_training import ModelTraining
 from config.paths_config import *
 from src.custom_exception import CustomException
 from src.logger import get_logger
+from src.profiling import configure_from_env, profile_stages
 
 logger = get_logger(__name__)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the training pipeline.")
+    parser.add_argument("--profile", metavar="STAGES",
+                        help="Comma-separated stages to profile, e.g. FeatureEngineer.feature_selection,DataProcessor. "
+                             "Reports go to logs/profiles/<run_id>/. Defaults to the PROFILE_STAGES environment variable.")
+    args = parser.parse_args()
+
+    if args.profile:
+        profile_stages(args.profile.split(","))
+    else:
+        configure_from_env()
 
     try:
 
@@ -2,6 +2,7 @@ import os
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from src.logger import get_logger
+from src.profiling import configure_from_env
 from src.custom_exception import CustomException
 from config.paths_config import *
 
@@ -92,6 +93,7 @@ class DataIngestion:
 
 # Main Execution
 if __name__ == "__main__":
+    configure_from_env()
     try:
         # Initialize DataIngestion
         ingestion = DataIngestion(raw_data_path=RAW_DATA_PATH, ingested_data_dir=INGESTED_DATA_DIR)
@@ -2,14 +2,15 @@ import os
 import pandas as pd
 from config.paths_config import *
 from src.logger import get_logger
+from src.profiling import configure_from_env
 from src.custom_exception import CustomException
 import sys
 logger = get_logger(__name__)
 
 class DataProcessor:
-    def __init__(self):
-        self.train_data_path = TRAIN_DATA_PATH
-        self.processed_data_path = PROCESSED_DATA_PATH
+    def __init__(self, train_data_path=TRAIN_DATA_PATH, processed_data_path=PROCESSED_DATA_PATH):
+        self.train_data_path = train_data_path
+        self.processed_data_path = processed_data_path
 
     def load_data(self):
         try:
@@ -108,5 +109,6 @@ class DataProcessor:
 
 
 if __name__ == "__main__":
+    configure_from_env()
     processor = DataProcessor()
     processor.run()
@@ -1,7 +1,5 @@
 import os
 import csv
-import mysql.connector
-from mysql.connector import Error
 from config.db_config import DB_CONFIG
 from src.logger import get_logger
 from src.custom_exception import CustomException
@@ -31,6 +29,9 @@ class MySQLDataExtractor:
 
     def connect(self):
         """Establish a connection to the MySQL database."""
+        import mysql.connector
+        from mysql.connector import Error
+
         try:
             self.connection = mysql.connector.connect(
                 host=self.host,
@@ -56,6 +57,8 @@ class MySQLDataExtractor:
         Parameters:
             output_folder (str): Path to the folder where the CSV file will be saved. Default is './artifacts/raw'.
         """
+        from mysql.connector import Error
+
         try:
             # Ensure connection is established
             if not self.connection or not self.connection.is_connected():
@@ -93,8 +96,9 @@ class MySQLDataExtractor:
 
 
 # Object Creation and Execution
-try:
-    extractor = MySQLDataExtractor(DB_CONFIG)
-    extractor.extract_to_csv()
-except CustomException as ce:
-    logger.error(str(ce))
+if __name__ == "__main__":
+    try:
+        extractor = MySQLDataExtractor(DB_CONFIG)
+        extractor.extract_to_csv()
+    except CustomException as ce:
+        logger.error(str(ce))
@@ -0,0 +1,275 @@
+import os
+import re
+import queue
+import shutil
+import socket
+import tempfile
+import time
+import traceback
+import multiprocessing
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+TREE_LEARNERS = ("data", "voting")
+
+# Parameters set by network_params(); strip_network_params() removes them from fitted models
+NETWORK_PARAMS = ("tree_learner", "num_machines", "machines", "local_listen_port", "pre_partition")
+
+# What a locally trained model records for those parameters in its model file
+LOCAL_NETWORK_VALUES = {
+    "tree_learner": "serial",
+    "num_machines": "1",
+    "machines": "",
+    "local_listen_port": "12400",
+    "pre_partition": "0",
+}
+
+# Set by _worker() on every fit. strip_network_params() drops them unless the candidate
+# params set them, mapping each to its model file key and the local default recorded there
+WORKER_PARAMS = {"num_threads": ("num_threads", "0"), "verbose": ("verbosity", "1")}
+
+
+def shard_data(data, num_shards, shard_dir):
+    """
+    Split a DataFrame into contiguous row blocks and write each one to its own CSV.
+
+    Parameters:
+        data (pd.DataFrame): Features and target.
+        num_shards (int): Number of shards, one per worker.
+        shard_dir (str): Directory the shards are written to.
+
+    Returns:
+        list: Shard file paths ordered by rank.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    shard_paths = []
+    for rank, rows in enumerate(np.array_split(np.arange(len(data)), num_shards)):
+        shard_path = os.path.join(shard_dir, f"shard_{rank}.csv")
+        data.iloc[rows].to_csv(shard_path, index=False)
+        shard_paths.append(shard_path)
+        logger.info(f"Shard {rank} written to {shard_path} with {len(rows)} rows")
+    return shard_paths
+
+
+def find_free_ports(host, count):
+    """Ask the OS for ``count`` currently unused ports on ``host``."""
+    sockets = []
+    try:
+        for _ in range(count):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind((host, 0))
+            sockets.append(sock)
+        return [sock.getsockname()[1] for sock in sockets]
+    finally:
+        for sock in sockets:
+            sock.close()
+
+
+def network_params(machines, rank, tree_learner="data"):
+    """
+    LightGBM parameters that join a worker to a socket-based training network.
+
+    Parameters:
+        machines (list): ``host:port`` entries for every worker, ordered by rank.
+            Local workers use 127.0.0.1; other nodes only need different hosts.
+        rank (int): Index of this worker in ``machines``.
+        tree_learner (str): ``"data"`` or ``"voting"`` parallel learning.
+
+    Returns:
+        dict: Parameters to merge into the model parameters.
+    """
+    return {
+        "tree_learner": tree_learner,
+        "num_machines": len(machines),
+        "machines": ",".join(machines),
+        "local_listen_port": int(machines[rank].rsplit(":", 1)[1]),
+        # Each worker only holds its own rows
+        "pre_partition": True,
+    }
+
+
+def _worker(rank, shard_path, target_column, num_threads, tasks, results):
+    """
+    Worker process: loads its shard once, then trains on every task until it gets None.
+    A task is ``(trial, params)`` where ``params`` already include the network settings.
+    """
+    import lightgbm as lgb
+
+    data = pd.read_csv(shard_path)
+    X = data.drop(columns=target_column)
+    y = data[target_column]
+    del data
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        trial, params = task
+        try:
+            # Candidate params override the worker defaults
+            model = lgb.LGBMClassifier(**{"num_threads": num_threads, "verbose": -1, **params})
+            model.fit(X, y)
+            # Every worker ends with the same model, only rank 0 sends it back
+            results.put((trial, rank, model if rank == 0 else None, None))
+        except Exception:
+            results.put((trial, rank, None, traceback.format_exc()))
+
+
+def strip_network_params(model, candidate_params=None):
+    """
+    Turn a model fitted by the workers into a plain local one. The network settings
+    and the worker's thread cap and verbosity are dropped from the estimator params
+    and reset in the booster's recorded parameters, so cloning, refitting,
+    warm-starting or reloading the saved model never tries to join the worker
+    network again or trains with one worker's share of the cores.
+
+    Parameters:
+        model (LGBMClassifier): Model returned by a distributed fit.
+        candidate_params (dict): Params the fit was requested with; worker settings set here are kept.
+
+    Returns:
+        LGBMClassifier: Equivalent fitted model without network parameters.
+    """
+    import lightgbm as lgb
+
+    worker_params = {key: value for key, value in WORKER_PARAMS.items() if key not in (candidate_params or {})}
+    params = {
+        key: value for key, value in model.get_params().items()
+        if key not in NETWORK_PARAMS and key not in worker_params
+    }
+    clean = type(model)(**params)
+    # Fitted state lives in the private attributes; _other_params is rebuilt from params above
+    clean.__dict__.update(
+        {key: value for key, value in vars(model).items() if key.startswith("_") and key != "_other_params"}
+    )
+    clean.fitted_ = model.fitted_
+
+    model_str = model.booster_.model_to_string()
+    local_values = {**LOCAL_NETWORK_VALUES, **dict(worker_params.values())}
+    for key, value in local_values.items():
+        model_str = re.sub(rf"^\[{key}: .*\]$", lambda _: f"[{key}: {value}]", model_str, flags=re.MULTILINE)
+    clean._Booster = lgb.Booster(model_str=model_str)
+    return clean
+
+
+class DistributedLGBMTrainer:
+    """
+    Trains one LightGBM model across several local worker processes with
+    LightGBM's data- or voting-parallel socket protocol. Each worker holds a row
+    shard for its whole lifetime, so several parameter sets can be fitted
+    without reloading data.
+    """
+
+    def __init__(self, num_workers=2, tree_learner="data", host="127.0.0.1", timeout=600):
+        """
+        Parameters:
+            num_workers (int): Number of worker processes (and data shards).
+            tree_learner (str): ``"data"`` or ``"voting"`` parallel learning.
+            host (str): Address the workers listen on.
+            timeout (int): Seconds to wait for a fit before giving up.
+        """
+        if num_workers < 2:
+            raise ValueError("Distributed training needs at least 2 workers")
+        if tree_learner not in TREE_LEARNERS:
+            raise ValueError(f"tree_learner must be one of {TREE_LEARNERS}, got {tree_learner!r}")
+
+        self.num_workers = num_workers
+        self.tree_learner = tree_learner
+        self.host = host
+        self.timeout = timeout
+        self.num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+
+        self._context = multiprocessing.get_context("spawn")
+        self._shard_dir = None
+        self._processes = []
+        self._task_queues = []
+        self._results = None
+        self._trials = 0
+
+    def start(self, X, y):
+        """Shard the training data and start the worker processes."""
+        target_column = y.name or "target"
+        self._shard_dir = tempfile.mkdtemp(prefix="lgbm_shards_")
+        shard_paths = shard_data(pd.concat([X, y.rename(target_column)], axis=1), self.num_workers, self._shard_dir)
+
+        self._results = self._context.Queue()
+        for rank, shard_path in enumerate(shard_paths):
+            tasks = self._context.Queue()
+            process = self._context.Process(
+                target=_worker,
+                args=(rank, shard_path, target_column, self.num_threads, tasks, self._results),
+                daemon=True,
+            )
+            process.start()
+            self._task_queues.append(tasks)
+            self._processes.append(process)
+        logger.info(f"Started {self.num_workers} LightGBM workers ({self.tree_learner}-parallel)")
+
+    def machines(self):
+        """Listen addresses for the next fit, on fresh ports so sockets lingering from the last fit never clash."""
+        return [f"{self.host}:{port}" for port in find_free_ports(self.host, self.num_workers)]
+
+    def fit(self, params):
+        """
+        Train one model on all shards.
+
+        Parameters:
+            params (dict): LGBMClassifier parameters.
+
+        Returns:
+            LGBMClassifier: The shared model, as trained by rank 0, without network parameters.
+        """
+        if not self._processes:
+            raise RuntimeError("Workers are not running, call start() first")
+
+        trial = self._trials
+        machines = self.machines()
+        self._trials += 1
+        for rank, tasks in enumerate(self._task_queues):
+            tasks.put((trial, {**params, **network_params(machines, rank, self.tree_learner)}))
+
+        model = None
+        deadline = time.monotonic() + self.timeout
+        for _ in range(self.num_workers):
+            while True:
+                try:
+                    result_trial, rank, worker_model, error = self._results.get(timeout=1.0)
+                    break
+                except queue.Empty:
+                    # Surviving workers would block in the network setup, so fail fast
+                    dead = [rank for rank, p in enumerate(self._processes) if not p.is_alive()]
+                    if dead:
+                        raise RuntimeError(f"Workers {dead} exited during distributed fit {trial}")
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"Distributed fit {trial} timed out after {self.timeout}s")
+            if error:
+                raise RuntimeError(f"Worker {rank} failed on trial {result_trial}:\n{error}")
+            if rank == 0:
+                model = worker_model
+
+        logger.info(f"Distributed fit {trial} completed with params: {params}")
+        return strip_network_params(model, params)
+
+    def close(self):
+        """Stop the workers and remove the shards."""
+        for tasks in self._task_queues:
+            tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._task_queues = []
+        if self._shard_dir:
+            shutil.rmtree(self._shard_dir, ignore_errors=True)
+            self._shard_dir = None
+        logger.info("LightGBM workers stopped")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
@@ -0,0 +1,128 @@
+import numpy as np
+
+METRICS = ("accuracy", "precision", "recall", "f1_score")
+
+
+def metrics_from_confusion(cm):
+    """
+    Accuracy and support-weighted precision, recall and F1 from confusion matrices.
+    Classes never predicted or never present score 0, like sklearn's ``zero_division=0``.
+
+    Parameters:
+        cm (np.ndarray): Counts with true labels on rows and predictions on columns, shape
+            ``(k, k)`` or a stack ``(..., k, k)``.
+
+    Returns:
+        dict: One value (or array over the stack) per name in METRICS.
+    """
+    cm = np.asarray(cm, dtype=np.float64)
+    total = cm.sum(axis=(-2, -1))
+    tp = np.diagonal(cm, axis1=-2, axis2=-1)
+    support = cm.sum(axis=-1)
+    predicted = cm.sum(axis=-2)
+
+    precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+    recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+    f1_denominator = support + predicted
+    f1 = np.divide(2 * tp, f1_denominator, out=np.zeros_like(tp), where=f1_denominator > 0)
+    weights = support / total[..., None]
+
+    return {
+        "accuracy": tp.sum(axis=-1) / total,
+        "precision": (precision * weights).sum(axis=-1),
+        "recall": (recall * weights).sum(axis=-1),
+        "f1_score": (f1 * weights).sum(axis=-1),
+    }
+
+
+class StreamingEvaluator:
+    """
+    Evaluates a classifier from chunks of labels and predictions, keeping only a
+    running confusion matrix. All metrics are derived from that matrix, and their
+    bootstrap confidence intervals are drawn from it too: resampling n rows with
+    replacement is a multinomial draw over the matrix cells, so every bootstrap
+    replicate is computed at once without revisiting the rows.
+    """
+
+    def __init__(self, n_bootstrap=1000, confidence=0.95, random_state=42):
+        """
+        Parameters:
+            n_bootstrap (int): Bootstrap replicates for the confidence intervals, 0 to skip them.
+            confidence (float): Coverage of the percentile intervals.
+            random_state (int): Seed for the bootstrap draws.
+        """
+        self.n_bootstrap = n_bootstrap
+        self.confidence = confidence
+        self.random_state = random_state
+        self.labels = np.array([], dtype=np.int64)
+        self.confusion_matrix = np.zeros((0, 0), dtype=np.int64)
+
+    def update(self, y_true, y_pred):
+        """Add one chunk of true labels and predictions to the running confusion matrix."""
+        y_true = np.asarray(y_true).ravel()
+        y_pred = np.asarray(y_pred).ravel()
+        if len(y_true) != len(y_pred):
+            raise ValueError(f"Got {len(y_true)} labels but {len(y_pred)} predictions")
+
+        # Grow the matrix when the chunk brings labels not seen so far
+        labels = np.union1d(self.labels, np.union1d(y_true, y_pred))
+        if len(labels) != len(self.labels):
+            grown = np.zeros((len(labels), len(labels)), dtype=np.int64)
+            positions = np.searchsorted(labels, self.labels)
+            grown[np.ix_(positions, positions)] = self.confusion_matrix
+            self.labels, self.confusion_matrix = labels, grown
+
+        k = len(self.labels)
+        cells = np.searchsorted(self.labels, y_true) * k + np.searchsorted(self.labels, y_pred)
+        self.confusion_matrix += np.bincount(cells, minlength=k * k).reshape(k, k)
+        return self
+
+    def update_from_model(self, model, X, y, chunk_rows=100_000):
+        """Predict ``X`` chunk by chunk with ``model`` and add the results."""
+        for start in range(0, len(X), chunk_rows):
+            X_chunk = X.iloc[start:start + chunk_rows] if hasattr(X, "iloc") else X[start:start + chunk_rows]
+            y_chunk = y.iloc[start:start + chunk_rows] if hasattr(y, "iloc") else y[start:start + chunk_rows]
+            self.update(y_chunk, model.predict(X_chunk))
+        return self
+
+    @property
+    def count(self):
+        return int(self.confusion_matrix.sum())
+
+    def confidence_intervals(self):
+        """
+        Percentile bootstrap intervals for every metric.
+
+        Returns:
+            dict: ``(low, high)`` per name in METRICS.
+        """
+        n = self.count
+        rng = np.random.default_rng(self.random_state)
+        k = len(self.labels)
+        samples = rng.multinomial(n, self.confusion_matrix.ravel() / n, size=self.n_bootstrap).reshape(-1, k, k)
+        replicates = metrics_from_confusion(samples)
+
+        alpha = (1 - self.confidence) / 2
+        return {
+            metric: tuple(float(bound) for bound in np.quantile(values, [alpha, 1 - alpha]))
+            for metric, values in replicates.items()
+        }
+
+    def metrics(self):
+        """
+        Metrics over everything seen so far.
+
+        Returns:
+            dict: Each metric, its ``<metric>_ci_low``/``<metric>_ci_high`` bounds when
+                bootstrapping is enabled, and the confusion matrix as a list.
+        """
+        if self.count == 0:
+            raise ValueError("No predictions have been evaluated")
+
+        results = {metric: float(value) for metric, value in metrics_from_confusion(self.confusion_matrix).items()}
+        if self.n_bootstrap:
+            for metric, (low, high) in self.confidence_intervals().items():
+                results[f"{metric}_ci_low"] = low
+                results[f"{metric}_ci_high"] = high
+        results["confusion_matrix"] = self.confusion_matrix.tolist()  # Convert to list for logging
+        return results
@@ -1,18 +1,72 @@
 import os
+import sys
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.feature_selection import mutual_info_classif
 from src.logger import get_logger
+from src.profiling import configure_from_env
 from src.custom_exception import CustomException
 from config.paths_config import *
-from utils.helpers import label_encode
+from utils.helpers import label_encode, mutual_information_from_counts
 
 # Setting up logger
 logger = get_logger(__name__)
 
+TARGET_COLUMN = 'satisfaction'
+COLUMNS_TO_ENCODE = ['Gender', 'Customer Type', 'Type of Travel', 'Class', 'satisfaction', 'Age Group']
+AGE_BINS = [0, 18, 30, 50, 100]
+AGE_LABELS = ['Child', 'Youngster', 'Adult', 'Senior']
+NUM_SELECTED_FEATURES = 12
+
+
+def add_delay_features(df):
+    df['Total Delay'] = df['Departure Delay in Minutes'] + df['Arrival Delay in Minutes']
+    df['Delay Ratio'] = df['Total Delay'] / (df['Flight Distance'] + 1)
+    return df
+
+
+def bin_ages(ages):
+    return pd.cut(ages, bins=AGE_BINS, labels=AGE_LABELS)
+
+
+def _engineer_block(block, label_mappings, train_mask, block_path):
+    """
+    Worker: construct, bin and encode one row block with the fitted mappings, save
+    it to ``block_path`` and count (feature value, target) pairs over its training rows.
+    """
+    block = add_delay_features(block)
+    block['Age Group'] = bin_ages(block['Age'])
+    for col, mapping in label_mappings.items():
+        block[col] = block[col].astype(object).map(mapping)
+
+    # Pickled blocks reload faster than CSV and keep floats exact
+    block.to_pickle(block_path)
+
+    train = block[train_mask]
+    return {col: train.groupby([col, TARGET_COLUMN]).size() for col in block.columns if col != TARGET_COLUMN}
+
+
 class FeatureEngineer:
-    def __init__(self):
-        self.data_path = PROCESSED_DATA_PATH
+    def __init__(self, data_path=PROCESSED_DATA_PATH, output_path=ENGINNERED_DATA, block_rows=None, num_workers=None):
+        """
+        Parameters:
+            data_path (str): Processed data CSV.
+            output_path (str): Where the engineered data is written.
+            block_rows (int): Process the data in row blocks of this size instead of all at once,
+                so memory is bounded by the block size. None keeps the in-memory pipeline.
+            num_workers (int): Processes engineering blocks in parallel in chunked mode. Defaults to all cores.
+        """
+        self.data_path = data_path
+        self.output_path = output_path
+        self.block_rows = block_rows
+        self.num_workers = num_workers or os.cpu_count() or 1
         self.df = None
         self.label_mappings = {}
 
@@ -30,8 +84,7 @@ class FeatureEngineer:
     def feature_construction(self):
         try:
             logger.info("Performing feature construction.")
-            self.df['Total Delay'] = self.df['Departure Delay in Minutes'] + self.df['Arrival Delay in Minutes']
-            self.df['Delay Ratio'] = self.df['Total Delay'] / (self.df['Flight Distance'] + 1)
+            self.df = add_delay_features(self.df)
             logger.info("Feature construction completed successfully.")
         except Exception as e:
             logger.error(f"Error during feature construction: {e}")
@@ -41,7 +94,7 @@ class FeatureEngineer:
     def bin_age(self):
         try:
             logger.info("Binning Age values.")
-            self.df['Age Group'] = pd.cut(self.df['Age'], bins=[0, 18, 30, 50, 100], labels=['Child', 'Youngster', 'Adult', 'Senior'])
+            self.df['Age Group'] = bin_ages(self.df['Age'])
             logger.info("Age binning completed successfully.")
         except Exception as e:
             logger.error(f"Error during binning age: {e}")
@@ -50,9 +103,8 @@ class FeatureEngineer:
     # Method for Label Encoding
     def label_encoding(self):
         try:
-            columns_to_encode = ['Gender', 'Customer Type', 'Type of Travel', 'Class', 'satisfaction', 'Age Group']
-            logger.info(f"Performing label encoding for columns: {columns_to_encode}")
-            self.df, self.label_mappings = label_encode(self.df, columns_to_encode)
+            logger.info(f"Performing label encoding for columns: {COLUMNS_TO_ENCODE}")
+            self.df, self.label_mappings = label_encode(self.df, COLUMNS_TO_ENCODE)
             
             # Log encoding mappings
             for col, mapping in self.label_mappings.items():
@@ -66,8 +118,8 @@ class FeatureEngineer:
     def feature_selection(self):
         try:
             logger.info("Performing feature selection using Mutual Information.")
-            X = self.df.drop(columns='satisfaction')
-            y = self.df['satisfaction']
+            X = self.df.drop(columns=TARGET_COLUMN)
+            y = self.df[TARGET_COLUMN]
 
             X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
@@ -81,8 +133,8 @@ class FeatureEngineer:
             logger.info(f"Mutual Information: \n{mutual_info_df}")
 
             # Selecting top 12 features
-            top_features = mutual_info_df.head(12)['Feature'].tolist()
-            self.df = self.df[top_features + ['satisfaction']]
+            top_features = mutual_info_df.head(NUM_SELECTED_FEATURES)['Feature'].tolist()
+            self.df = self.df[top_features + [TARGET_COLUMN]]
             logger.info(f"Final selected features: {top_features}")
         except Exception as e:
             logger.error(f"Error during feature selection: {e}")
@@ -91,23 +143,134 @@ class FeatureEngineer:
     # Method to save the processed data
     def save_processed_data(self):
         try:
-            os.makedirs(ENGINNERED_DIR, exist_ok=True)
-            self.df.to_csv(ENGINNERED_DATA, index=False)
-            logger.info(f"Final dataframe saved at {ENGINNERED_DATA}")
+            os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+            self.df.to_csv(self.output_path, index=False)
+            logger.info(f"Final dataframe saved at {self.output_path}")
         except Exception as e:
             logger.error(f"Error while saving processed data: {e}")
             raise CustomException("Error while saving processed data", e)
 
+    # Method to fit the label encodings with one pass over the categorical columns
+    def fit_label_mappings(self):
+        try:
+            logger.info(f"Fitting label encodings for columns: {COLUMNS_TO_ENCODE}")
+            source_columns = [col for col in COLUMNS_TO_ENCODE if col != 'Age Group'] + ['Age']
+            classes = {col: set() for col in COLUMNS_TO_ENCODE}
+            n_rows = 0
+            for chunk in pd.read_csv(self.data_path, usecols=source_columns, chunksize=self.block_rows):
+                n_rows += len(chunk)
+                chunk['Age Group'] = bin_ages(chunk['Age'])
+                for col in COLUMNS_TO_ENCODE:
+                    classes[col].update(chunk[col].dropna().unique())
+
+            # Sorted classes get consecutive codes, as LabelEncoder assigns them
+            self.label_mappings = {
+                col: {value: code for code, value in enumerate(sorted(classes[col]))} for col in COLUMNS_TO_ENCODE
+            }
+            for col, mapping in self.label_mappings.items():
+                logger.info(f"Mapping for {col}: {mapping}")
+            logger.info(f"Label encodings fitted on {n_rows} rows.")
+            return n_rows
+        except Exception as e:
+            logger.error(f"Error while fitting label encodings: {e}")
+            raise CustomException("Error while fitting label encodings", sys)
+
+    def _engineered_blocks(self, train_mask, work_dir):
+        """
+        Engineer the data block by block into ``work_dir``, yielding each block's path and
+        pair counts in row order. At most two blocks per worker are in flight at any time.
+        """
+        reader = pd.read_csv(self.data_path, chunksize=self.block_rows)
+        tasks = (
+            (block, self.label_mappings, train_mask[i * self.block_rows:i * self.block_rows + len(block)],
+             os.path.join(work_dir, f"block_{i:06d}.pkl"))
+            for i, block in enumerate(reader)
+        )
+        if self.num_workers == 1:
+            for task in tasks:
+                yield task[-1], _engineer_block(*task)
+            return
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.num_workers, mp_context=context) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append((task[-1], pool.submit(_engineer_block, *task)))
+                if len(pending) >= 2 * self.num_workers:
+                    block_path, future = pending.popleft()
+                    yield block_path, future.result()
+            while pending:
+                block_path, future = pending.popleft()
+                yield block_path, future.result()
+
+    # Chunked pipeline: memory is bounded by the block size, not the dataset
+    def run_chunked(self):
+        try:
+            logger.info(f"Starting chunked feature engineering with {self.block_rows} rows per block "
+                        f"and {self.num_workers} workers.")
+            n_rows = self.fit_label_mappings()
+
+            # Same rows as the train_test_split in feature_selection, which only depends on the row count
+            train_rows, _ = train_test_split(np.arange(n_rows), test_size=0.2, random_state=42)
+            train_mask = np.zeros(n_rows, dtype=bool)
+            train_mask[train_rows] = True
+
+            os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+            work_dir = tempfile.mkdtemp(prefix="feature_blocks_", dir=os.path.dirname(self.output_path))
+            try:
+                # Per-block counts are reduced once at the end; merging them block by block
+                # would cost O(accumulated size) per block, quadratic in the number of blocks.
+                # They hold one entry per distinct (value, target) pair per block, so for
+                # continuous columns such as Delay Ratio their size grows with the distinct
+                # values in the data rather than staying bounded by the block size.
+                block_paths = []
+                block_counts = {}
+                for block_path, counts in self._engineered_blocks(train_mask, work_dir):
+                    block_paths.append(block_path)
+                    for col, col_counts in counts.items():
+                        block_counts.setdefault(col, []).append(col_counts)
+                logger.info(f"Feature construction, binning and encoding completed for {n_rows} rows.")
+
+                # Discrete Mutual Information from the summed counts equals mutual_info_classif on the train rows
+                mutual_info = {}
+                for col in list(block_counts):
+                    joint_counts = pd.concat(block_counts.pop(col)).groupby(level=[0, 1]).sum()
+                    mutual_info[col] = mutual_information_from_counts(joint_counts)
+                mutual_info_df = pd.DataFrame({
+                    'Feature': list(mutual_info),
+                    'Mutual Information': list(mutual_info.values())
+                }).sort_values(by='Mutual Information', ascending=False)
+                logger.info(f"Mutual Information: \n{mutual_info_df}")
+
+                top_features = mutual_info_df.head(NUM_SELECTED_FEATURES)['Feature'].tolist()
+                logger.info(f"Final selected features: {top_features}")
+
+                selected = top_features + [TARGET_COLUMN]
+                if os.path.exists(self.output_path):
+                    os.remove(self.output_path)
+                for i, block_path in enumerate(block_paths):
+                    pd.read_pickle(block_path)[selected].to_csv(self.output_path, mode='a', header=i == 0, index=False)
+                    os.remove(block_path)
+                logger.info(f"Final dataframe saved at {self.output_path}")
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        except Exception as e:
+            logger.error(f"Error during chunked feature engineering: {e}")
+            raise CustomException("Error during chunked feature engineering", sys)
+
     # Main pipeline to run the feature engineering
     def run(self):
         try:
             logger.info("Starting the feature engineering process.")
-            self.load_data()
-            self.feature_construction()
-            self.bin_age()
-            self.label_encoding()
-            self.feature_selection()
-            self.save_processed_data()
+            if self.block_rows:
+                self.run_chunked()
+            else:
+                self.load_data()
+                self.feature_construction()
+                self.bin_age()
+                self.label_encoding()
+                self.feature_selection()
+                self.save_processed_data()
             logger.info("Feature engineering pipeline completed successfully.")
         except CustomException as ce:
             logger.error(f"Feature engineering execution failed: {str(ce)}")
@@ -118,5 +281,13 @@ class FeatureEngineer:
             logger.info("End of feature engineering pipeline.")
 
 if __name__ == "__main__":
-    feature_engineer = FeatureEngineer()
+    parser = argparse.ArgumentParser(description="Engineer and select features from the processed data.")
+    parser.add_argument("--block-rows", type=int, default=None,
+                        help="Process the data in row blocks of this size, bounding memory by the block size.")
+    parser.add_argument("--num-workers", type=int, default=None,
+                        help="Processes engineering blocks in parallel with --block-rows. Defaults to all cores.")
+    args = parser.parse_args()
+
+    configure_from_env()
+    feature_engineer = FeatureEngineer(block_rows=args.block_rows, num_workers=args.num_workers)
     feature_engineer.run()
@@ -1,30 +1,54 @@
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, AdaBoostClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.svm import SVC
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.naive_bayes import GaussianNB
-from sklearn.tree import DecisionTreeClassifier
-import lightgbm as lgb
-import xgboost as xgb
-from torch.utils.tensorboard import SummaryWriter
+import argparse
+import numpy as np
 import pandas as pd
 from config.paths_config import *
 from src.logger import get_logger
+from src.profiling import configure_from_env
 from src.custom_exception import CustomException
-import matplotlib.pyplot as plt
+from src.tracking import TensorBoardTracker
+from src.shared_features import SharedFeatureMatrix
+from src.evaluation import StreamingEvaluator
+from joblib import Parallel, delayed
 import time
 
 logger = get_logger(__name__)
 
+def _fit_predict(model, X_train, y_train, X_test):
+    model.fit(X_train, y_train)
+    return model, model.predict(X_test)
+
+
 class ClassifierComparison:
-    def __init__(self, data_path):
+    def __init__(self, data_path, render_figures=True, n_jobs=None, full_evaluation=False, chunk_rows=100_000):
         self.data_path = data_path
+        self.n_jobs = n_jobs
+        # Also evaluate on every row left out of the training sample, streamed in chunks
+        self.full_evaluation = full_evaluation
+        self.chunk_rows = chunk_rows
         run_id = time.strftime("%Y%m%d-%H%M%S")
-        self.writer = SummaryWriter(log_dir=f"tensorboard_logs/run_{run_id}")
+        # torch is only needed for its SummaryWriter, so import it when a comparison is actually run
+        from torch.utils.tensorboard import SummaryWriter
+
+        # TensorBoard writes and figure rendering happen off the training thread
+        self.writer = TensorBoardTracker(SummaryWriter(log_dir=f"tensorboard_logs/run_{run_id}"),
+                                         render_figures=render_figures)
+        self.models = self.build_models()
+        self.results = {}
 
-        self.models = {
+    @staticmethod
+    def build_models():
+        """Creates the candidate classifiers, importing each backend only here."""
+        from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, AdaBoostClassifier
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.svm import SVC
+        from sklearn.neighbors import KNeighborsClassifier
+        from sklearn.naive_bayes import GaussianNB
+        from sklearn.tree import DecisionTreeClassifier
+        import lightgbm as lgb
+        import xgboost as xgb
+
+        return {
             'Logistic Regression': LogisticRegression(),
             'Random Forest': RandomForestClassifier(n_estimators=50, n_jobs=-1),
             'Gradient Boosting': GradientBoostingClassifier(n_estimators=50),
@@ -36,7 +60,6 @@ class ClassifierComparison:
             'LightGBM': lgb.LGBMClassifier(),
             'XGBoost': xgb.XGBClassifier(eval_metric='mlogloss')
         }
-        self.results = {}
 
     def load_data(self):
         try:
@@ -57,56 +80,73 @@ class ClassifierComparison:
         except Exception as e:
             raise CustomException(f"Error splitting data: {str(e)}")
 
-    def log_confusion_matrix(self, y_true, y_pred, step, model_name):
-        cm = confusion_matrix(y_true, y_pred)
-        fig, ax = plt.subplots(figsize=(5, 5))
-        ax.matshow(cm, cmap=plt.cm.Blues, alpha=0.7)
-        for i in range(cm.shape[0]):
-            for j in range(cm.shape[1]):
-                ax.text(x=j, y=i, s=cm[i, j], va='center', ha='center')
-
-        plt.xlabel('Predicted Labels')
-        plt.ylabel('True Labels')
-        plt.title(f'Confusion Matrix: {model_name}')
-        self.writer.add_figure(f'Confusion Matrix/{model_name}', fig, global_step=step)
-        plt.close(fig)
+    def log_confusion_matrix(self, cm, step, model_name):
+        self.writer.add_confusion_matrix(model_name, cm, step)
+
+    def fit_predict_all(self, X_train, X_test, y_train):
+        """Fits every model and returns its test predictions, in parallel processes when n_jobs is set."""
+        if self.n_jobs in (None, 1):
+            return {name: model.fit(X_train, y_train).predict(X_test) for name, model in self.models.items()}
+
+        # Workers attach to shared float32 copies instead of each unpickling the DataFrames
+        with SharedFeatureMatrix(X_train) as train, SharedFeatureMatrix(X_test) as test:
+            fitted = Parallel(n_jobs=self.n_jobs)(
+                delayed(_fit_predict)(model, train.array, y_train.to_numpy(), test.array)
+                for model in self.models.values()
+            )
+        predictions = {}
+        for name, (model, y_pred) in zip(self.models, fitted):
+            self.models[name] = model
+            predictions[name] = y_pred
+        return predictions
+
+    def evaluate_unsampled_rows(self, evaluators, sampled_index):
+        """Streams the rows outside the training sample from disk and adds every model's predictions on them."""
+        logger.info(f"Evaluating on all unsampled rows in chunks of {self.chunk_rows}")
+        for chunk in pd.read_csv(self.data_path, chunksize=self.chunk_rows):
+            # Chunks keep the row positions as index, the same labels df.sample drew from
+            chunk = chunk[~chunk.index.isin(sampled_index)]
+            if chunk.empty:
+                continue
+            X = chunk.drop(columns='satisfaction')
+            if self.n_jobs not in (None, 1):
+                # Parallel fits saw the shared float32 matrix, not the DataFrame
+                X = X.to_numpy(dtype=np.float32)
+            for name, model in self.models.items():
+                evaluators[name].update(chunk['satisfaction'], model.predict(X))
 
     def train_and_evaluate(self, X_train, X_test, y_train, y_test):
         try:
             logger.info("Training and evaluating classifiers")
-            for idx, (name, model) in enumerate(self.models.items()):
-                model.fit(X_train, y_train)
-                y_pred = model.predict(X_test)
-
-                # Metrics
-                accuracy = accuracy_score(y_test, y_pred)
-                precision = precision_score(y_test, y_pred, average='weighted', zero_division=0)
-                recall = recall_score(y_test, y_pred, average='weighted', zero_division=0)
-                f1 = f1_score(y_test, y_pred, average='weighted', zero_division=0)
+            predictions = self.fit_predict_all(X_train, X_test, y_train)
+            evaluators = {name: StreamingEvaluator().update(y_test, y_pred) for name, y_pred in predictions.items()}
+            if self.full_evaluation:
+                self.evaluate_unsampled_rows(evaluators, X_train.index.union(X_test.index))
+
+            for idx, (name, evaluator) in enumerate(evaluators.items()):
+
+                # Metrics with 95% bootstrap confidence intervals, all from one confusion matrix
+                metrics = evaluator.metrics()
+                accuracy, precision, recall, f1 = (metrics[metric] for metric in ('accuracy', 'precision', 'recall', 'f1_score'))
+                summary = ", ".join(
+                    f"{label}: {metrics[metric]:.4f} [{metrics[f'{metric}_ci_low']:.4f}, {metrics[f'{metric}_ci_high']:.4f}]"
+                    for label, metric in (('Accuracy', 'accuracy'), ('Precision', 'precision'),
+                                          ('Recall', 'recall'), ('F1 Score', 'f1_score'))
+                )
 
                 # Log results
-                self.results[name] = {
-                    'accuracy': accuracy,
-                    'precision': precision,
-                    'recall': recall,
-                    'f1_score': f1
-                }
-                logger.info(f"{name} trained successfully with metrics: "
-                            f"Accuracy: {accuracy:.4f}, Precision: {precision:.4f}, Recall: {recall:.4f}, F1 Score: {f1:.4f}")
+                self.results[name] = {metric: value for metric, value in metrics.items() if metric != 'confusion_matrix'}
+                logger.info(f"{name} trained successfully with metrics on {evaluator.count} rows: {summary}")
 
                 # Log metrics to TensorBoard
                 self.writer.add_scalar(f'Accuracy/{name}', accuracy, idx)
                 self.writer.add_scalar(f'Precision/{name}', precision, idx)
                 self.writer.add_scalar(f'Recall/{name}', recall, idx)
                 self.writer.add_scalar(f'F1 Score/{name}', f1, idx)
-                self.writer.add_text('Model Details', f"{name}: "
-                                                      f"Accuracy: {accuracy:.4f}, "
-                                                      f"Precision: {precision:.4f}, "
-                                                      f"Recall: {recall:.4f}, "
-                                                      f"F1 Score: {f1:.4f}", idx)
+                self.writer.add_text('Model Details', f"{name}: {summary}", idx)
 
                 # Log confusion matrix
-                self.log_confusion_matrix(y_test, y_pred, idx, name)
+                self.log_confusion_matrix(evaluator.confusion_matrix, idx, name)
 
             self.writer.close()
         except Exception as e:
@@ -124,7 +164,13 @@ class ClassifierComparison:
             raise
 
 if __name__ == "__main__":
-    pipeline = ClassifierComparison(ENGINNERED_DATA)
+    parser = argparse.ArgumentParser(description="Compare classifiers on a sample of the engineered data.")
+    parser.add_argument("--full-evaluation", action="store_true",
+                        help="Also evaluate every model on all rows outside the training sample, streamed in chunks.")
+    args = parser.parse_args()
+
+    configure_from_env()
+    pipeline = ClassifierComparison(ENGINNERED_DATA, full_evaluation=args.full_evaluation)
     pipeline.run()
 
     print("To view results, run the following command in your terminal:")
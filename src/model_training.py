@@ -1,22 +1,36 @@
 import os
+import argparse
 import pandas as pd
 import sys
 import joblib
 import json
-import mlflow
-import mlflow.sklearn
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
+import numpy as np
+from sklearn.model_selection import train_test_split, GridSearchCV, ParameterGrid
+from sklearn.metrics import accuracy_score
 import lightgbm as lgb
 from src.logger import get_logger
 from src.custom_exception import CustomException
+from src.tracking import MLflowTracker
+from src.distributed_training import DistributedLGBMTrainer
+from src.shared_features import SharedFeatureMatrix, contiguous_folds
+from src.evaluation import StreamingEvaluator
+from src.profiling import configure_from_env, profile_stages
 from config.paths_config import *
+from utils.helpers import population_stability_index
 
 # Initialize logger
 logger = get_logger(__name__)
 
+
+def _score_fold(X, y, params, train, test, feature_name):
+    """Fit one candidate on the ``train`` slice and return its accuracy on the ``test`` slice."""
+    model = lgb.LGBMClassifier(**params).fit(X[train], y[train], feature_name=feature_name)
+    return accuracy_score(y[test], model.predict(X[test]))
+
+
 class ModelTraining:
-    def __init__(self, data_path, params_path, model_save_path, experiment_name="Model_Training_Experiment"):
+    def __init__(self, data_path, params_path, model_save_path, experiment_name="Model_Training_Experiment",
+                 num_workers=1, tree_learner="data", n_jobs=None):
         """
         Initializes the ModelTraining class.
         Args:
@@ -24,10 +38,20 @@ class ModelTraining:
             params_path (str): Path to the JSON file containing hyperparameters.
             model_save_path (str): Path to save the trained model.
             experiment_name (str): Name of the MLflow experiment.
+            num_workers (int): Number of LightGBM worker processes. Values above 1 enable distributed training.
+            tree_learner (str): Parallel learning mode for distributed training, "data" or "voting".
+            n_jobs (int): Parallel hyperparameter search workers; they read one shared memory-mapped copy of the features.
         """
         self.data_path = data_path
         self.params_path = params_path
         self.model_save_path = model_save_path
+        # LightGBM's own text format, loadable without unpickling the sklearn wrapper
+        self.native_model_path = os.path.splitext(model_save_path)[0] + ".txt"
+        # Global feature importances, computed once here so serving never recomputes them
+        self.importance_path = os.path.splitext(model_save_path)[0] + "_importance.json"
+        self.num_workers = num_workers
+        self.tree_learner = tree_learner
+        self.n_jobs = n_jobs
         self.best_model = None
         self.metrics = None
         self.experiment_name = experiment_name
@@ -44,6 +68,10 @@ class ModelTraining:
 
     def train_model(self, X_train, y_train, params):
         """Trains the model with hyperparameter tuning."""
+        if self.num_workers > 1:
+            return self.train_model_distributed(X_train, y_train, params)
+        if self.n_jobs not in (None, 1):
+            return self.train_model_parallel(X_train, y_train, params)
         try:
             logger.info("Starting model training with hyperparameter tuning")
             lgbm = lgb.LGBMClassifier()
@@ -55,40 +83,266 @@ class ModelTraining:
         except Exception as e:
             raise CustomException("Error during model training", sys)
 
+    def train_model_parallel(self, X_train, y_train, params):
+        """
+        Same search as the serial GridSearchCV (3 stratified folds, accuracy, refit on
+        all rows) with trials in ``n_jobs`` processes over one shared float32 copy of
+        the features. Rows are stored fold by fold, so every training and test fold
+        is a slice that workers read in place, where GridSearchCV would copy each
+        fold into the worker. Each worker still builds its own binned LightGBM
+        Dataset, so memory keeps growing with ``n_jobs`` by that much.
+        """
+        try:
+            # Resolve negative values like joblib does, e.g. -2 means all cores but one
+            n_jobs = joblib.effective_n_jobs(self.n_jobs)
+            trial_threads = max(1, (os.cpu_count() or 1) // n_jobs)
+            logger.info(f"Starting parallel hyperparameter search with {n_jobs} workers")
+
+            row_order, folds = contiguous_folds(y_train.to_numpy(), n_splits=3)
+            y = np.tile(y_train.to_numpy()[row_order], 2)
+            candidates = list(ParameterGrid(params))
+            with SharedFeatureMatrix(X_train, row_order=row_order, wrap=True) as shared:
+                scores = joblib.Parallel(n_jobs=n_jobs)(
+                    joblib.delayed(_score_fold)(shared.cyclic, y, {**candidate, "n_jobs": trial_threads},
+                                                train, test, shared.columns)
+                    for candidate in candidates
+                    for train, test in folds
+                )
+                mean_scores = np.reshape(scores, (len(candidates), len(folds))).mean(axis=1)
+                for candidate, score in zip(candidates, mean_scores):
+                    logger.info(f"CV accuracy {score:.4f} for params: {candidate}")
+
+                # Ties go to the first candidate, as in GridSearchCV; the refit uses every core
+                best_params = candidates[int(np.argmax(mean_scores))]
+                self.best_model = lgb.LGBMClassifier(**best_params)
+                self.best_model.fit(shared.array, y[:len(row_order)], feature_name=shared.columns)
+            logger.info("Model training completed")
+            return best_params
+        except Exception as e:
+            raise CustomException("Error during model training", sys)
+
+    def train_model_distributed(self, X_train, y_train, params):
+        """
+        Runs the hyperparameter search with every fit spread over row shards in
+        ``num_workers`` LightGBM processes. Candidates are scored on a holdout
+        split instead of 3-fold CV, so each combination costs a single distributed fit.
+        The best candidate is then refit on all of ``X_train``, like GridSearchCV's refit.
+        """
+        try:
+            logger.info(f"Starting distributed model training with {self.num_workers} workers")
+            X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.2, random_state=42)
+            best_score, best_params = None, None
+            with DistributedLGBMTrainer(num_workers=self.num_workers, tree_learner=self.tree_learner) as trainer:
+                trainer.start(X_fit, y_fit)
+                for candidate in ParameterGrid(params):
+                    model = trainer.fit(candidate)
+                    score = accuracy_score(y_val, model.predict(X_val))
+                    logger.info(f"Validation accuracy {score:.4f} for params: {candidate}")
+                    if best_score is None or score > best_score:
+                        best_score, best_params = score, candidate
+
+            # Workers hold their shards for life, so the refit needs new ones cut from all rows
+            logger.info(f"Refitting the best params on all {len(X_train)} training rows")
+            with DistributedLGBMTrainer(num_workers=self.num_workers, tree_learner=self.tree_learner) as trainer:
+                trainer.start(X_train, y_train)
+                self.best_model = trainer.fit(best_params)
+            logger.info("Model training completed")
+            return best_params
+        except Exception as e:
+            raise CustomException("Error during distributed model training", sys)
+
     def evaluate_model(self, X_test, y_test):
-        """Evaluates the model and logs performance metrics."""
+        """Evaluates the model chunk by chunk and logs performance metrics with bootstrap confidence intervals."""
         try:
             logger.info("Evaluating the model")
-            y_pred = self.best_model.predict(X_test)
-            self.metrics = {
-                "accuracy": accuracy_score(y_test, y_pred),
-                "precision": precision_score(y_test, y_pred, average='weighted'),
-                "recall": recall_score(y_test, y_pred, average='weighted'),
-                "f1_score": f1_score(y_test, y_pred, average='weighted'),
-                "confusion_matrix": confusion_matrix(y_test, y_pred).tolist()  # Convert to list for logging
-            }
+            self.metrics = StreamingEvaluator().update_from_model(self.best_model, X_test, y_test).metrics()
             logger.info(f"Evaluation metrics: {self.metrics}")
             return self.metrics
         except Exception as e:
             raise CustomException("Error during model evaluation", sys)
 
+    @staticmethod
+    def compute_metrics(y_true, y_pred):
+        """Computes the evaluation metrics for a set of predictions."""
+        return StreamingEvaluator().update(y_true, y_pred).metrics()
+
     def save_model(self):
         """Saves the trained model to the specified path."""
         try:
             logger.info(f"Saving model to {self.model_save_path}")
             os.makedirs(os.path.dirname(self.model_save_path), exist_ok=True)
             joblib.dump(self.best_model, self.model_save_path)
-            logger.info("Model saved successfully")
+            self.best_model.booster_.save_model(self.native_model_path)
+            with open(self.importance_path, 'w') as f:
+                json.dump(self.feature_importances(), f, indent=2)
+            logger.info(f"Model saved successfully, native booster at {self.native_model_path}")
         except Exception as e:
             raise CustomException("Error saving model", sys)
 
+    def feature_importances(self):
+        """Global gain and split importances of the best model, keyed by feature name and sorted by gain."""
+        booster = self.best_model.booster_
+        # LightGBM stores column names with spaces replaced by underscores
+        features = [name.replace("_", " ") for name in booster.feature_name()]
+        gain = dict(zip(features, booster.feature_importance(importance_type="gain").tolist()))
+        split = dict(zip(features, booster.feature_importance(importance_type="split").tolist()))
+        order = sorted(features, key=gain.get, reverse=True)
+        return {
+            "gain": {feature: gain[feature] for feature in order},
+            "split": {feature: split[feature] for feature in order},
+        }
+
+    def load_previous_model(self):
+        """
+        Loads the currently deployed model for a warm start.
+
+        Returns:
+            tuple: The sklearn estimator (None when only the native file is usable) and its booster.
+        """
+        try:
+            if os.path.exists(self.model_save_path):
+                try:
+                    model = joblib.load(self.model_save_path)
+                    logger.info(f"Previous model loaded from {self.model_save_path}")
+                    return model, model.booster_
+                except Exception as e:
+                    if not os.path.exists(self.native_model_path):
+                        raise
+                    logger.warning(f"Could not unpickle {self.model_save_path} ({e}), using the native model file")
+            booster = lgb.Booster(model_file=self.native_model_path)
+            logger.info(f"Previous booster loaded from {self.native_model_path}")
+            return None, booster
+        except Exception as e:
+            raise CustomException("Error loading previous model", sys)
+
+    def update_model(self, previous_model, init_booster, X_new, y_new, num_rounds):
+        """Continues boosting the previous model on new rows for at most ``num_rounds`` rounds."""
+        try:
+            logger.info(f"Warm-starting from the previous model for {num_rounds} rounds on {len(X_new)} new rows")
+            if previous_model is not None:
+                params = previous_model.get_params()
+            else:
+                params = {key: init_booster.params[key] for key in ("learning_rate", "max_depth", "num_leaves")
+                          if key in init_booster.params}
+            params["n_estimators"] = num_rounds
+            model = lgb.LGBMClassifier(**params)
+            model.fit(X_new, y_new, init_model=init_booster)
+            logger.info(f"Model updated, now {model.booster_.num_trees()} trees")
+            return model
+        except Exception as e:
+            raise CustomException("Error during incremental model update", sys)
+
+    def append_partition(self, new_data, columns):
+        """Appends an accepted partition to the training data, in the file's column order."""
+        try:
+            new_data[columns].to_csv(self.data_path, mode="a", header=False, index=False)
+            logger.info(f"Appended {len(new_data)} rows to {self.data_path}")
+        except Exception as e:
+            raise CustomException("Error appending the new partition to the training data", sys)
+
+    def run_incremental(self, new_data_path, num_rounds=50, drift_threshold=0.25, degradation_threshold=0.01):
+        """
+        Updates the saved model with a new data partition instead of retraining from scratch.
+
+        The new rows are split into update and holdout sets. The model keeps boosting
+        on the update set and must score within ``degradation_threshold`` accuracy of
+        the previous model on the holdout. If any feature drifts beyond
+        ``drift_threshold`` (population stability index against the current training
+        data) or the update degrades, the model is retrained from scratch on the
+        current and new data combined.
+
+        Once the updated model is saved, in either mode, the new rows are appended to
+        ``data_path``, so later drift checks and fallback retrains cover every accepted
+        partition. Rerunning the feature engineering stage rewrites that file without them.
+
+        Args:
+            new_data_path (str): Path to a CSV of new rows in the engineered format.
+            num_rounds (int): Maximum number of boosting rounds added to the previous model.
+            drift_threshold (float): Highest tolerated per-feature PSI.
+            degradation_threshold (float): Highest tolerated accuracy drop on the holdout.
+        """
+        import mlflow
+
+        try:
+            mlflow.set_experiment(self.experiment_name)
+
+            with mlflow.start_run() as run, MLflowTracker(run.info.run_id) as tracker:
+                data = self.load_data()
+                logger.info(f"Loading new data partition from {new_data_path}")
+                new_data = pd.read_csv(new_data_path)
+
+                X_new = new_data.drop(columns='satisfaction')
+                y_new = new_data['satisfaction']
+                X_update, X_holdout, y_update, y_holdout = train_test_split(X_new, y_new, test_size=0.2, random_state=42)
+
+                drift = {column: population_stability_index(data[column], new_data[column]) for column in X_new.columns}
+                max_drift_feature = max(drift, key=drift.get)
+                logger.info(f"Feature drift (PSI): {drift}")
+                tracker.log_params({"update_rounds": num_rounds, "new_rows": len(new_data)})
+                tracker.log_metrics({f"psi_{column}": value for column, value in drift.items()})
+
+                previous_model, init_booster = self.load_previous_model()
+                if previous_model is not None:
+                    previous_pred = previous_model.predict(X_holdout)
+                else:
+                    previous_pred = (init_booster.predict(X_holdout) > 0.5).astype(int)
+                previous_metrics = self.compute_metrics(y_holdout, previous_pred)
+                logger.info(f"Previous model metrics on new holdout: {previous_metrics}")
+                tracker.log_metrics({f"previous_{metric}": value for metric, value in previous_metrics.items()
+                                     if metric != "confusion_matrix"})
+
+                fallback_reason = None
+                if drift[max_drift_feature] > drift_threshold:
+                    fallback_reason = f"drift in '{max_drift_feature}' (PSI {drift[max_drift_feature]:.3f})"
+                else:
+                    self.best_model = self.update_model(previous_model, init_booster, X_update, y_update, num_rounds)
+                    metrics = self.evaluate_model(X_holdout, y_holdout)
+                    degradation = previous_metrics["accuracy"] - metrics["accuracy"]
+                    if degradation > degradation_threshold:
+                        fallback_reason = f"accuracy dropped by {degradation:.4f} on the new holdout"
+
+                # MLflow rejects changed param values, so the mode is logged once it is final
+                if fallback_reason:
+                    logger.warning(f"Falling back to a full retrain: {fallback_reason}")
+                    tracker.log_params({"mode": "full_retrain", "fallback_reason": fallback_reason})
+
+                    combined = pd.concat([data, new_data], ignore_index=True)
+                    X_train, X_test, y_train, y_test = train_test_split(
+                        combined.drop(columns='satisfaction'), combined['satisfaction'], test_size=0.2, random_state=42)
+                    with open(self.params_path, 'r') as f:
+                        params = json.load(f)
+                    best_params = self.train_model(X_train, y_train, params)
+                    tracker.log_params({f"best_{key}": value for key, value in best_params.items()})
+                    metrics = self.evaluate_model(X_test, y_test)
+                else:
+                    tracker.log_params({"mode": "incremental"})
+
+                tracker.log_metrics({metric: value for metric, value in metrics.items() if metric != "confusion_matrix"})
+
+                self.save_model()
+                self.append_partition(new_data, data.columns)
+                tracker.log_model(self.best_model, "model")
+                tracker.log_artifact(self.importance_path)
+
+        except CustomException as ce:
+            logger.error(str(ce))
+            mlflow.end_run(status="FAILED")
+        except Exception as e:
+            logger.error("An unexpected error occurred during the incremental update")
+            mlflow.end_run(status="FAILED")
+            raise CustomException("Unexpected error in the incremental update workflow", sys)
+
     def run(self):
         """Executes the complete workflow of loading data, training, evaluating, and saving the model."""
+        # MLflow is slow to import and only needed once a run starts
+        import mlflow
+
         try:
             # Set up MLflow experiment
             mlflow.set_experiment(self.experiment_name)
 
-            with mlflow.start_run():
+            # Params, metrics and the model are written from a background thread
+            with mlflow.start_run() as run, MLflowTracker(run.info.run_id) as tracker:
                 # Load the dataset
                 data = self.load_data()
 
@@ -104,22 +358,22 @@ class ModelTraining:
                 logger.info(f"Loaded hyperparameters: {params}")
                 
                 # Log initial parameters with unique keys
-                mlflow.log_params({f"grid_{key}": value for key, value in params.items()})
+                tracker.log_params({f"grid_{key}": value for key, value in params.items()})
+                tracker.log_params({"num_workers": self.num_workers})
 
                 # Train the model
                 best_params = self.train_model(X_train, y_train, params)
                 logger.info(f"Best parameters from tuning: {best_params}")
-                mlflow.log_params({f"best_{key}": value for key, value in best_params.items()})  # Log best parameters
+                tracker.log_params({f"best_{key}": value for key, value in best_params.items()})  # Log best parameters
 
                 # Evaluate the model
                 metrics = self.evaluate_model(X_test, y_test)
-                for metric, value in metrics.items():
-                    if metric != "confusion_matrix":
-                        mlflow.log_metric(metric, value)  # Log metrics
+                tracker.log_metrics({metric: value for metric, value in metrics.items() if metric != "confusion_matrix"})
 
                 # Save and log the model
                 self.save_model()
-                mlflow.sklearn.log_model(self.best_model, "model")  # Log the model
+                tracker.log_model(self.best_model, "model")  # Log the model in the background
+                tracker.log_artifact(self.importance_path)
 
         except CustomException as ce:
             logger.error(str(ce))
@@ -131,10 +385,37 @@ class ModelTraining:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the LightGBM model.")
+    parser.add_argument("--num-workers", type=int, default=1,
+                        help="LightGBM worker processes; more than 1 trains data-parallel over row shards.")
+    parser.add_argument("--tree-learner", choices=["data", "voting"], default="data",
+                        help="Parallel learning mode used with --num-workers.")
+    parser.add_argument("--n-jobs", type=int, default=None,
+                        help="Parallel grid search workers sharing one memory-mapped feature matrix (-1 for all cores).")
+    parser.add_argument("--update-from", metavar="NEW_DATA_CSV",
+                        help="Warm-start the saved model on this new engineered data partition instead of retraining.")
+    parser.add_argument("--update-rounds", type=int, default=50,
+                        help="Maximum boosting rounds added by an incremental update.")
+    parser.add_argument("--profile", metavar="STAGES",
+                        help="Comma-separated ModelTraining methods to profile, e.g. ModelTraining.train_model. "
+                             "Defaults to the PROFILE_STAGES environment variable.")
+    args = parser.parse_args()
+
+    if args.profile:
+        profile_stages(args.profile.split(","))
+    else:
+        configure_from_env()
+
     # Initialize and run the training process
     model_trainer = ModelTraining(
         data_path=ENGINNERED_DATA,
         params_path=PARAMS_PATH,
-        model_save_path=MODEL_PATH
+        model_save_path=MODEL_PATH,
+        num_workers=args.num_workers,
+        tree_learner=args.tree_learner,
+        n_jobs=args.n_jobs
     )
-    model_trainer.run()
+    if args.update_from:
+        model_trainer.run_incremental(args.update_from, num_rounds=args.update_rounds)
+    else:
+        model_trainer.run()
@@ -0,0 +1,238 @@
+import cProfile
+import functools
+import importlib
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_DIR = os.path.join("logs", "profiles")
+
+# Environment switches; nothing is wrapped or hooked unless one of them is set
+PROFILE_STAGES_ENV = "PROFILE_STAGES"
+PROFILE_REQUEST_RATE_ENV = "PROFILE_REQUEST_RATE"
+PROFILE_RUN_ID_ENV = "PROFILE_RUN_ID"
+
+# Classes whose methods can be selected as "Class.method" (a bare "Class" means its run method)
+PROFILABLE_CLASSES = {
+    "DataIngestion": "src.data_ingestion",
+    "DataProcessor": "src.data_processing",
+    "FeatureEngineer": "src.feature_engineering",
+    "ModelTraining": "src.model_training",
+    "ClassifierComparison": "src.model_selection",
+}
+
+DEFAULT_SAMPLE_INTERVAL = 0.005
+TOP_ALLOCATIONS = 25
+
+_run_id = None
+_counter = itertools.count()
+# cProfile is process-wide from Python 3.12, so at most one Profiler runs at a time
+_profile_lock = threading.Lock()
+
+
+def get_run_id():
+    """Run ID used to group the reports of one process, from PROFILE_RUN_ID or the start time."""
+    global _run_id
+    if _run_id is None:
+        _run_id = os.environ.get(PROFILE_RUN_ID_ENV) or time.strftime("%Y%m%d-%H%M%S")
+    return _run_id
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval and counts collapsed stacks."""
+
+    def __init__(self, thread_id, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="StackSampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def write_collapsed(self, path):
+        """Write stacks in the collapsed format read by flamegraph.pl and speedscope."""
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """
+    Profiles a block with cProfile, tracemalloc and a stack sampler, then writes
+    ``<label>-<n>.pstats``, ``.collapsed`` and ``.alloc.txt`` under ``logs/profiles/<run_id>/``.
+    Only one profiler runs per process; a profiler started while another one is
+    active (nested stages, overlapping requests) is skipped. Profiling errors are
+    logged and never propagate into the profiled code.
+    """
+
+    def __init__(self, label, output_dir=PROFILE_DIR, sample_interval=DEFAULT_SAMPLE_INTERVAL):
+        self.label = label
+        self.output_dir = os.path.join(output_dir, get_run_id())
+        self.sample_interval = sample_interval
+        self._enabled = False
+
+    def start(self):
+        if not _profile_lock.acquire(blocking=False):
+            logger.info(f"Another profile is running, skipping {self.label}")
+            return
+        self._sampler = None
+        self._profile = None
+        self._started_tracemalloc = False
+        try:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._sampler = StackSampler(threading.get_ident(), self.sample_interval)
+            self._sampler.start()
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            self._enabled = True
+        except Exception as e:
+            logger.error(f"Could not start profiling {self.label}: {e}")
+            self._release()
+
+    def stop(self):
+        if not self._enabled:
+            return
+        self._enabled = False
+        try:
+            self._profile.disable()
+            self._sampler.stop()
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            self._write_reports(snapshot, peak)
+        except Exception as e:
+            logger.error(f"Could not write the profile of {self.label}: {e}")
+        finally:
+            self._release()
+
+    def _release(self):
+        """Undo whatever start() set up and let the next profiler run."""
+        try:
+            if self._profile is not None:
+                self._profile.disable()
+            if self._sampler is not None:
+                self._sampler.stop()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        except Exception as e:
+            logger.error(f"Could not clean up the profiler of {self.label}: {e}")
+        finally:
+            _profile_lock.release()
+
+    def _write_reports(self, snapshot, peak):
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"{self.label}-{next(_counter)}")
+        self._profile.dump_stats(f"{base}.pstats")
+        self._sampler.write_collapsed(f"{base}.collapsed")
+        with open(f"{base}.alloc.txt", "w") as f:
+            f.write(f"Peak traced memory: {peak / 1e6:.1f} MB\n")
+            f.write(f"Top {TOP_ALLOCATIONS} allocations by line:\n")
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+        logger.info(f"Profile of {self.label} written to {base}.*")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.stop()
+
+
+def profile_stages(specs):
+    """
+    Wrap the selected stage methods in a Profiler. Methods that are not selected stay untouched.
+
+    Parameters:
+        specs (list): Entries like "FeatureEngineer.feature_selection" or "DataProcessor".
+    """
+    for spec in specs:
+        class_name, _, method_name = spec.strip().partition(".")
+        if class_name not in PROFILABLE_CLASSES:
+            raise ValueError(f"Unknown stage class '{class_name}', expected one of {list(PROFILABLE_CLASSES)}")
+        # A stage run as a script defines its class in __main__, which is the copy actually called
+        cls = getattr(sys.modules["__main__"], class_name, None)
+        if cls is None:
+            cls = getattr(importlib.import_module(PROFILABLE_CLASSES[class_name]), class_name)
+        method_name = method_name or "run"
+        method = getattr(cls, method_name)
+        if getattr(method, "__profiled__", False):
+            continue
+
+        label = f"{class_name}.{method_name}"
+        setattr(cls, method_name, _profiled(method, label))
+        logger.info(f"Profiling enabled for {label}, run ID {get_run_id()}")
+
+
+def _profiled(method, label):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with Profiler(label):
+            return method(*args, **kwargs)
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+def profile_requests(app, rate):
+    """Profile a random ``rate`` fraction of the Flask app's requests. No hooks are added when rate is 0."""
+    if rate <= 0:
+        return
+    from flask import g, request
+
+    # Profiling must never turn a request into an error, whatever goes wrong in it
+    @app.before_request
+    def _start_request_profile():
+        if random.random() < rate:
+            try:
+                g.profiler = Profiler(f"request{request.path.replace('/', '_')}")
+                g.profiler.start()
+            except Exception as e:
+                logger.error(f"Could not profile request {request.path}: {e}")
+
+    @app.teardown_request
+    def _stop_request_profile(exc):
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            try:
+                profiler.stop()
+            except Exception as e:
+                logger.error(f"Could not finish request profile: {e}")
+
+    logger.info(f"Profiling {rate:.1%} of requests, run ID {get_run_id()}")
+
+
+def configure_from_env(app=None):
+    """Apply PROFILE_STAGES and, for the service, PROFILE_REQUEST_RATE. Does nothing when they are unset."""
+    stages = os.environ.get(PROFILE_STAGES_ENV)
+    if stages:
+        profile_stages([spec for spec in stages.split(",") if spec.strip()])
+    if app is not None:
+        profile_requests(app, float(os.environ.get(PROFILE_REQUEST_RATE_ENV, 0)))
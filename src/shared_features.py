@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+from sklearn.model_selection import StratifiedKFold
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# tmpfs on Linux, so a memory-mapped file there is plain shared memory
+SHARED_MEMORY_DIR = "/dev/shm"
+
+
+class SharedFeatureMatrix:
+    """
+    Materializes a feature DataFrame once as a contiguous float32 ``.npy`` file and
+    exposes it as a read-only memory map.
+
+    joblib pickles ``np.memmap`` arrays as a reference to their file, so process
+    workers attach to the same pages instead of receiving a pickled copy each.
+    Only slices stay views of those pages: fancy indexing, as in sklearn's CV
+    splitting, copies the selected rows into every worker. Use ``contiguous_folds``
+    with ``wrap=True`` to cross-validate over slices only.
+    """
+
+    def __init__(self, X, directory=None, block_rows=100_000, row_order=None, wrap=False):
+        """
+        Parameters:
+            X (pd.DataFrame): Numeric feature matrix.
+            directory (str): Where the ``.npy`` file is created. Defaults to /dev/shm when available.
+            block_rows (int): Rows converted per block while writing, bounding the extra memory needed.
+            row_order (np.ndarray): Positions of the rows of X in the order they are stored. Defaults to X's order.
+            wrap (bool): Store the rows twice back to back as ``cyclic``, so any cyclic run of rows,
+                e.g. everything except one fold, is a single slice. Doubles the shared file only.
+        """
+        if directory is None:
+            directory = SHARED_MEMORY_DIR if os.path.isdir(SHARED_MEMORY_DIR) else tempfile.gettempdir()
+        self._dir = tempfile.mkdtemp(prefix="shared_features_", dir=directory)
+        self.path = os.path.join(self._dir, "features.npy")
+        self.columns = list(X.columns)
+
+        if row_order is None:
+            row_order = np.arange(len(X))
+        n_rows = len(X)
+        copies = 2 if wrap else 1
+
+        matrix = np.lib.format.open_memmap(self.path, mode="w+", dtype=np.float32, shape=(n_rows * copies, X.shape[1]))
+        for start in range(0, n_rows, block_rows):
+            block = X.iloc[row_order[start:start + block_rows]].to_numpy(dtype=np.float32)
+            for copy in range(copies):
+                matrix[copy * n_rows + start:copy * n_rows + start + len(block)] = block
+        matrix.flush()
+        del matrix
+
+        stored = np.load(self.path, mmap_mode="r")
+        self.array = stored[:n_rows]
+        self.cyclic = stored if wrap else None
+        logger.info(f"Shared feature matrix {stored.shape} ({stored.nbytes / 1e6:.1f} MB) at {self.path}")
+
+    def close(self):
+        """Release the memory map and delete the backing file."""
+        self.array = None
+        self.cyclic = None
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+
+def contiguous_folds(y, n_splits=3):
+    """
+    Stratified K-fold splits expressed as slices. Rows are reordered so each test
+    fold is one contiguous run; the matching training rows then form one run of a
+    matrix stored twice back to back (``SharedFeatureMatrix(..., wrap=True)``).
+    The folds hold the same rows as sklearn's default ``cv=n_splits`` for classifiers.
+
+    Parameters:
+        y (np.ndarray): Class labels.
+        n_splits (int): Number of folds.
+
+    Returns:
+        tuple: Row order to store the data in, and ``(train, test)`` slices per fold,
+            indexing the twice-stored matrix.
+    """
+    test_folds = [test for _, test in StratifiedKFold(n_splits=n_splits).split(np.zeros(len(y)), y)]
+    row_order = np.concatenate(test_folds)
+    bounds = np.cumsum([0] + [len(test) for test in test_folds])
+    folds = [
+        (slice(int(bounds[i + 1]), int(bounds[i]) + len(y)), slice(int(bounds[i]), int(bounds[i + 1])))
+        for i in range(n_splits)
+    ]
+    return row_order, folds
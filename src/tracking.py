@@ -0,0 +1,268 @@
+import os
+import queue
+import tempfile
+import threading
+import time
+import warnings
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Sentinel pushed onto the task queue to stop the background worker
+_STOP = object()
+
+
+class BackgroundTracker:
+    """
+    Runs tracking calls on a daemon thread so the training thread never waits on
+    the tracking store. Subclasses buffer cheap calls and write them out in
+    ``_flush_buffers``, which runs every ``flush_interval`` seconds and on close.
+    """
+
+    def __init__(self, flush_interval=2.0):
+        """
+        Parameters:
+            flush_interval (float): Seconds between periodic flushes of the buffers.
+        """
+        self.flush_interval = flush_interval
+        self._tasks = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def _submit(self, fn, *args, **kwargs):
+        """Queue a call to run on the background thread."""
+        if self._closed:
+            logger.warning(f"{type(self).__name__} is closed, dropping call to {fn.__name__}")
+            return
+        self._tasks.put((fn, args, kwargs))
+
+    def _worker(self):
+        while True:
+            try:
+                task = self._tasks.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._safe_call(self._flush_buffers)
+                continue
+
+            try:
+                if task is _STOP:
+                    self._safe_call(self._flush_buffers)
+                    return
+                fn, args, kwargs = task
+                self._safe_call(fn, *args, **kwargs)
+            finally:
+                self._tasks.task_done()
+
+    def _safe_call(self, fn, *args, **kwargs):
+        # Tracking failures are logged, never propagated into training
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Background tracking call {fn.__name__} failed: {e}")
+
+    def _flush_buffers(self):
+        """Write out buffered calls. Runs on the background thread."""
+
+    def flush(self):
+        """Block until every queued call and buffered value has been written."""
+        self._submit(self._flush_buffers)
+        self._tasks.join()
+
+    def close(self):
+        """Flush outstanding work and stop the background thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._tasks.put(_STOP)
+        self._thread.join()
+        logger.info(f"{type(self).__name__} closed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class MLflowTracker(BackgroundTracker):
+    """
+    Buffers MLflow params and metrics and sends them with ``log_batch``;
+    artifacts and models are uploaded on the background thread. Entries the
+    store rejects are dropped one by one, never with their whole batch, and
+    reported when the tracker closes. Params are immutable in MLflow, so logging
+    a key again with a different value raises right away, whether or not the
+    first value has been flushed yet.
+    """
+
+    # Per-request limits enforced by the MLflow tracking server
+    MAX_PARAMS_PER_BATCH = 100
+    MAX_METRICS_PER_BATCH = 1000
+
+    def __init__(self, run_id, flush_interval=2.0, max_buffer_size=1000):
+        """
+        Parameters:
+            run_id (str): ID of the active MLflow run to log into.
+            flush_interval (float): Seconds between periodic flushes of the buffers.
+            max_buffer_size (int): Number of buffered metrics that triggers an early flush.
+        """
+        from mlflow.tracking import MlflowClient
+
+        self.client = MlflowClient()
+        self.run_id = run_id
+        self.max_buffer_size = max_buffer_size
+        self._lock = threading.Lock()
+        self._params = {}
+        self._metrics = []
+        # Every param value logged so far, flushed or not
+        self._logged_params = {}
+        # Keys of params and metrics the tracking store rejected
+        self.dropped_params = []
+        self.dropped_metrics = []
+        super().__init__(flush_interval)
+
+    def log_params(self, params):
+        """Buffer a dict of params. Raises ValueError if a key was already logged with another value."""
+        params = {key: str(value) for key, value in params.items()}
+        with self._lock:
+            changed = {key: (self._logged_params[key], value) for key, value in params.items()
+                       if self._logged_params.get(key, value) != value}
+            if changed:
+                raise ValueError(f"MLflow params cannot change once logged, got new values for {changed}")
+            self._logged_params.update(params)
+            self._params.update(params)
+
+    def log_metric(self, key, value, step=0):
+        """Buffer a single metric value."""
+        self.log_metrics({key: value}, step=step)
+
+    def log_metrics(self, metrics, step=0):
+        """Buffer a dict of metric values sharing one step."""
+        from mlflow.entities import Metric
+
+        timestamp = int(time.time() * 1000)
+        with self._lock:
+            self._metrics.extend(Metric(key, float(value), timestamp, step) for key, value in metrics.items())
+            buffer_full = len(self._metrics) >= self.max_buffer_size
+        if buffer_full:
+            self._submit(self._flush_buffers)
+
+    def log_artifact(self, local_path, artifact_path=None):
+        """Upload a local file to the run in the background."""
+        self._submit(self.client.log_artifact, self.run_id, local_path, artifact_path)
+
+    def log_model(self, model, artifact_path):
+        """Serialize and upload an sklearn-compatible model in the background."""
+        self._submit(self._log_sklearn_model, model, artifact_path)
+
+    def _log_sklearn_model(self, model, artifact_path):
+        import mlflow.sklearn
+
+        # The active run is thread-local, so save locally and upload through the client
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            local_path = os.path.join(tmp_dir, artifact_path)
+            mlflow.sklearn.save_model(model, local_path,
+                                      serialization_format=mlflow.sklearn.SERIALIZATION_FORMAT_CLOUDPICKLE)
+            self.client.log_artifacts(self.run_id, local_path, artifact_path)
+        logger.info(f"Model logged to MLflow under '{artifact_path}'")
+
+    def _flush_buffers(self):
+        from mlflow.entities import Param
+
+        with self._lock:
+            params = [Param(key, value) for key, value in self._params.items()]
+            metrics = self._metrics
+            self._params = {}
+            self._metrics = []
+
+        # Params and metrics go in separate batches so a rejected param never takes metrics down with it
+        for start in range(0, len(params), self.MAX_PARAMS_PER_BATCH):
+            self._send_batch("params", params[start:start + self.MAX_PARAMS_PER_BATCH], self.dropped_params)
+        for start in range(0, len(metrics), self.MAX_METRICS_PER_BATCH):
+            self._send_batch("metrics", metrics[start:start + self.MAX_METRICS_PER_BATCH], self.dropped_metrics)
+
+    def _send_batch(self, kind, entries, dropped):
+        """Send one batch; if it fails, retry entry by entry and record the ones that still fail."""
+        try:
+            self.client.log_batch(self.run_id, **{kind: entries})
+            logger.info(f"Flushed {len(entries)} {kind} to MLflow")
+            return
+        except Exception as e:
+            logger.warning(f"Batch of {len(entries)} {kind} rejected ({e}), retrying one at a time")
+
+        for entry in entries:
+            try:
+                self.client.log_batch(self.run_id, **{kind: [entry]})
+            except Exception as e:
+                dropped.append(entry.key)
+                logger.error(f"Dropped {kind[:-1]} '{entry.key}': {e}")
+
+    def close(self):
+        """Flush outstanding work, stop the background thread and report anything that was dropped."""
+        if self._closed:
+            return
+        super().close()
+        if not (self.dropped_params or self.dropped_metrics):
+            return
+
+        summary = f"params {self.dropped_params}, metrics {self.dropped_metrics}"
+        logger.error(f"MLflow rejected and dropped {summary}")
+        warnings.warn(f"MLflow run {self.run_id} is missing rejected values: {summary}", RuntimeWarning)
+        try:
+            self.client.set_tag(self.run_id, "tracking.dropped", summary[:5000])
+        except Exception as e:
+            logger.error(f"Could not tag run {self.run_id} with the dropped values: {e}")
+
+
+class TensorBoardTracker(BackgroundTracker):
+    """
+    Forwards scalars, text and confusion matrices to a TensorBoard ``SummaryWriter``
+    from the background thread. Figure rendering can be switched off entirely.
+    """
+
+    def __init__(self, writer, render_figures=True, flush_interval=2.0):
+        """
+        Parameters:
+            writer (SummaryWriter): TensorBoard writer to forward calls to.
+            render_figures (bool): Render confusion matrix figures. Skipped when False.
+            flush_interval (float): Seconds between periodic flushes of the writer.
+        """
+        self.writer = writer
+        self.render_figures = render_figures
+        super().__init__(flush_interval)
+
+    def add_scalar(self, tag, value, step):
+        self._submit(self.writer.add_scalar, tag, value, step)
+
+    def add_text(self, tag, text, step):
+        self._submit(self.writer.add_text, tag, text, step)
+
+    def add_confusion_matrix(self, model_name, cm, step):
+        """Queue a confusion matrix figure; rendering happens on the background thread."""
+        if not self.render_figures:
+            return
+        self._submit(self._render_confusion_matrix, model_name, cm, step)
+
+    def _render_confusion_matrix(self, model_name, cm, step):
+        # Use the object-oriented API: pyplot keeps global state and is not thread-safe
+        from matplotlib import cm as colormaps
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(5, 5))
+        ax = fig.add_subplot()
+        ax.matshow(cm, cmap=colormaps.Blues, alpha=0.7)
+        for i in range(cm.shape[0]):
+            for j in range(cm.shape[1]):
+                ax.text(x=j, y=i, s=cm[i, j], va='center', ha='center')
+
+        ax.set_xlabel('Predicted Labels')
+        ax.set_ylabel('True Labels')
+        ax.set_title(f'Confusion Matrix: {model_name}')
+        self.writer.add_figure(f'Confusion Matrix/{model_name}', fig, global_step=step, close=False)
+
+    def _flush_buffers(self):
+        self.writer.flush()
+
+    def close(self):
+        super().close()
+        self.writer.close()
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import LabelEncoder
 
@@ -10,3 +11,30 @@ def label_encode(df, columns_to_encode):
         df[col] = le.fit_transform(df[col])
         label_mappings[col] = dict(zip(le.classes_, le.transform(le.classes_)))
     return df, label_mappings
+
+
+# Function for Population Stability Index between a reference and a current sample
+def population_stability_index(reference, current, bins=10):
+    edges = np.unique(np.quantile(reference, np.linspace(0, 1, bins + 1)[1:-1]))
+    edges = np.concatenate([[-np.inf], edges, [np.inf]])
+    eps = 1e-6
+    ref_share = np.histogram(reference, bins=edges)[0] / len(reference) + eps
+    cur_share = np.histogram(current, bins=edges)[0] / len(current) + eps
+    return float(np.sum((cur_share - ref_share) * np.log(cur_share / ref_share)))
+
+
+# Function for discrete Mutual Information from joint (feature value, target) counts, computed as sklearn's mutual_info_score
+def mutual_information_from_counts(joint_counts):
+    contingency = joint_counts.unstack(fill_value=0).to_numpy(dtype=np.float64)
+    total = contingency.sum()
+    row_sums = contingency.sum(axis=1)
+    col_sums = contingency.sum(axis=0)
+    if row_sums.size == 1 or col_sums.size == 1:
+        return 0.0
+    nzx, nzy = np.nonzero(contingency)
+    nz_counts = contingency[nzx, nzy]
+    joint = nz_counts / total
+    log_outer = -np.log(row_sums[nzx] * col_sums[nzy]) + 2 * np.log(total)
+    mi = joint * (np.log(nz_counts) - np.log(total)) + joint * log_outer
+    mi = np.where(np.abs(mi) < np.finfo(mi.dtype).eps, 0.0, mi)
+    return float(max(mi.sum(), 0.0))